@@ -1,13 +1,15 @@
 """Caching system for tree-sitter parse trees."""
 
 import logging
+import os
 import threading
 import time
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, Optional, Set, Tuple, Union
 
 # Import global_context at runtime to avoid circular imports
+from ..utils.tree_sitter_helpers import set_parser_language
 from ..utils.tree_sitter_types import (
     Parser,
     Tree,
@@ -22,19 +24,33 @@ logger = logging.getLogger(__name__)
 class TreeCache:
     """Cache for parsed syntax trees."""
 
-    def __init__(self, max_size_mb: Optional[int] = None, ttl_seconds: Optional[int] = None):
+    def __init__(self, max_size_mb: Optional[int] = None, ttl_seconds: Optional[float] = None):
         """Initialize the tree cache with explicit size and TTL settings."""
         self.cache: Dict[str, Tuple[Any, bytes, float]] = {}  # (tree, source, timestamp)
         self.lock = threading.RLock()
         self.current_size_bytes = 0
         self.modified_trees: Dict[str, bool] = {}
+        # Entries for files being edited, evicted only after all other entries
+        self.hot_keys: Set[str] = set()
+        # Most recent cache key for each (language, path), for revalidate()
+        self.current_keys: Dict[Tuple[str, str], str] = {}
         self.max_size_mb = max_size_mb or 100
         self.ttl_seconds = ttl_seconds or 300
         self.enabled = True
 
-    def _get_cache_key(self, file_path: Path, language: str) -> str:
+    def _get_cache_key(self, file_path: Union[str, Path], language: str) -> str:
         """Generate cache key from file path and language."""
-        return f"{language}:{str(file_path)}:{file_path.stat().st_mtime}"
+        # Work on the string form so str paths never build a Path object
+        path_str = os.fspath(file_path)
+        return f"{language}:{path_str}:{os.stat(path_str).st_mtime}"
+
+    def _forget_key(self, cache_key: str) -> None:
+        """Drop a removed cache key from the current-key index."""
+        # Keys are "<language>:<path>:<mtime>"; paths may contain colons
+        language, _, rest = cache_key.partition(":")
+        file_id = (language, rest.rpartition(":")[0])
+        if self.current_keys.get(file_id) == cache_key:
+            del self.current_keys[file_id]
 
     def set_enabled(self, enabled: bool) -> None:
         """Set whether caching is enabled."""
@@ -44,7 +60,7 @@ class TreeCache:
         """Set maximum cache size in MB."""
         self.max_size_mb = max_size_mb
 
-    def set_ttl_seconds(self, ttl_seconds: int) -> None:
+    def set_ttl_seconds(self, ttl_seconds: float) -> None:
         """Set TTL for cache entries in seconds."""
         self.ttl_seconds = ttl_seconds
 
@@ -60,7 +76,7 @@ class TreeCache:
             # Fallback to instance value if container unavailable
             return self.max_size_mb
 
-    def _get_ttl_seconds(self) -> int:
+    def _get_ttl_seconds(self) -> float:
         """Get current TTL setting."""
         # Always get the latest from container config
         try:
@@ -90,7 +106,7 @@ class TreeCache:
             # Fallback to instance value if container unavailable
             return self.enabled
 
-    def get(self, file_path: Path, language: str) -> Optional[Tuple[Tree, bytes]]:
+    def get(self, file_path: Union[str, Path], language: str) -> Optional[Tuple[Tree, bytes]]:
         """
         Get cached tree if available and not expired.
 
@@ -125,6 +141,8 @@ class TreeCache:
                     self.current_size_bytes -= len(source)
                     if cache_key in self.modified_trees:
                         del self.modified_trees[cache_key]
+                    self.hot_keys.discard(cache_key)
+                    self._forget_key(cache_key)
                     return None
 
                 # Cast to the correct type for type checking
@@ -133,7 +151,54 @@ class TreeCache:
 
         return None
 
-    def put(self, file_path: Path, language: str, tree: Tree, source: bytes) -> None:
+    def revalidate(self, file_path: Union[str, Path], language: str, source: bytes) -> Optional[Tuple[Tree, bytes]]:
+        """
+        Reuse a tree cached under an older mtime if the file's content is unchanged.
+
+        Cache keys include the file's mtime, so touching a file or checking out
+        identical content misses in get(). Comparing the cached source with the
+        current bytes lets such a file skip parsing; the entry is moved to the
+        current key.
+
+        Args:
+            file_path: Path to the source file
+            language: Language identifier
+            source: Current source bytes of the file
+
+        Returns:
+            Tuple of (tree, source_bytes) if an unchanged entry was found, None otherwise
+        """
+        if not self._is_cache_enabled():
+            return None
+
+        path_str = os.fspath(file_path)
+        try:
+            cache_key = self._get_cache_key(path_str, language)
+        except (FileNotFoundError, OSError):
+            return None
+
+        with self.lock:
+            key = self.current_keys.get((language, path_str))
+            if key is None or key == cache_key or key not in self.cache:
+                return None
+
+            tree, cached_source, timestamp = self.cache[key]
+            # Edited trees may not match their source until reparsed
+            if self.modified_trees.get(key) or time.time() - timestamp > self._get_ttl_seconds():
+                return None
+            if cached_source != source:
+                return None
+
+            del self.cache[key]
+            self.modified_trees.pop(key, None)
+            self.cache[cache_key] = (tree, cached_source, time.time())
+            self.modified_trees[cache_key] = False
+            self.current_keys[(language, path_str)] = cache_key
+            # A revalidated entry was not just edited, so it is not hot
+            self.hot_keys.discard(key)
+            return ensure_tree(tree), cached_source
+
+    def put(self, file_path: Union[str, Path], language: str, tree: Tree, source: bytes, hot: bool = False) -> None:
         """
         Cache a parsed tree.
 
@@ -142,6 +207,7 @@ class TreeCache:
             language: Language identifier
             tree: Parsed tree
             source: Source bytes
+            hot: Whether the file is being edited (see put_hot)
         """
         # Check if caching is enabled
         is_enabled = self._is_cache_enabled()
@@ -149,8 +215,9 @@ class TreeCache:
             logger.debug(f"Skipping cache for {file_path}: caching is disabled")
             return
 
+        path_str = os.fspath(file_path)
         try:
-            cache_key = self._get_cache_key(file_path, language)
+            cache_key = self._get_cache_key(path_str, language)
         except (FileNotFoundError, OSError):
             return
 
@@ -181,6 +248,7 @@ class TreeCache:
 
             # Store the new entry
             self.cache[cache_key] = (tree, source, time.time())
+            self.current_keys[(language, path_str)] = cache_key
             self.current_size_bytes += source_size
             logger.debug(
                 f"Added entry to cache: {file_path}, size: {source_size / 1024:.1f}KB, "
@@ -189,8 +257,27 @@ class TreeCache:
 
             # Mark as not modified (fresh parse)
             self.modified_trees[cache_key] = False
+            if hot:
+                self.hot_keys.add(cache_key)
+            else:
+                self.hot_keys.discard(cache_key)
 
-    def mark_modified(self, file_path: Path, language: str) -> None:
+    def put_hot(self, file_path: Union[str, Path], language: str, tree: Tree, source: bytes) -> None:
+        """
+        Cache a tree for a file that is being edited.
+
+        Hot entries are kept over entries cached by ordinary parses when the
+        cache needs to evict, so actively edited files survive bulk scans.
+
+        Args:
+            file_path: Path to the source file
+            language: Language identifier
+            tree: Parsed tree
+            source: Source bytes
+        """
+        self.put(file_path, language, tree, source, hot=True)
+
+    def mark_modified(self, file_path: Union[str, Path], language: str) -> None:
         """
         Mark a tree as modified for tracking changes.
 
@@ -206,7 +293,7 @@ class TreeCache:
         except (FileNotFoundError, OSError):
             pass
 
-    def is_modified(self, file_path: Path, language: str) -> bool:
+    def is_modified(self, file_path: Union[str, Path], language: str) -> bool:
         """
         Check if a tree has been modified since last parse.
 
@@ -224,7 +311,7 @@ class TreeCache:
         except (FileNotFoundError, OSError):
             return False
 
-    def update_tree(self, file_path: Path, language: str, tree: Tree, source: bytes) -> None:
+    def update_tree(self, file_path: Union[str, Path], language: str, tree: Tree, source: bytes) -> None:
         """
         Update a cached tree after modification.
 
@@ -272,8 +359,9 @@ class TreeCache:
         if not self.cache:
             return
 
-        # Sort by timestamp (oldest first)
-        sorted_entries = sorted(self.cache.items(), key=lambda item: item[1][2])
+        # Sort by timestamp (oldest first), with hot entries after all others
+        hot_keys = self.hot_keys
+        sorted_entries = sorted(self.cache.items(), key=lambda item: (item[0] in hot_keys, item[1][2]))
 
         bytes_freed = 0
         entries_removed = 0
@@ -302,6 +390,8 @@ class TreeCache:
             del self.cache[key]
             if key in self.modified_trees:
                 del self.modified_trees[key]
+            hot_keys.discard(key)
+            self._forget_key(key)
 
             entry_size = len(source)
             bytes_freed += entry_size
@@ -335,6 +425,8 @@ class TreeCache:
                 # Clear entire cache
                 self.cache.clear()
                 self.modified_trees.clear()
+                self.hot_keys.clear()
+                self.current_keys.clear()
                 self.current_size_bytes = 0
             else:
                 # Clear only entries for this file
@@ -345,6 +437,8 @@ class TreeCache:
                     del self.cache[key]
                     if key in self.modified_trees:
                         del self.modified_trees[key]
+                    self.hot_keys.discard(key)
+                    self._forget_key(key)
 
 
 # The TreeCache is now initialized and managed by the DependencyContainer in di.py
@@ -364,17 +458,6 @@ def get_tree_cache() -> TreeCache:
 def get_cached_parser(language: Any) -> Parser:
     """Get a cached parser for a language."""
     parser = Parser()
-    safe_language = ensure_language(language)
-
-    # Try both set_language and language methods
-    try:
-        parser.set_language(safe_language)  # type: ignore
-    except AttributeError:
-        if hasattr(parser, "language"):
-            # Use the language method if available
-            parser.language = safe_language  # type: ignore
-        else:
-            # Fallback to setting the attribute directly
-            parser.language = safe_language  # type: ignore
+    set_parser_language(parser, ensure_language(language))
 
     return ensure_parser(parser)
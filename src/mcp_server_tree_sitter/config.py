@@ -17,7 +17,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 
 import yaml
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 # Import logging from bootstrap package
 from .bootstrap import get_logger, update_log_levels
@@ -30,7 +30,7 @@ class CacheConfig(BaseModel):
 
     enabled: bool = True
     max_size_mb: int = 100
-    ttl_seconds: int = 300  # Time-to-live for cached items
+    ttl_seconds: float = 300  # Time-to-live for cached items
 
 
 class SecurityConfig(BaseModel):
@@ -42,6 +42,9 @@ class SecurityConfig(BaseModel):
     )
     allowed_extensions: Optional[List[str]] = None  # None means all extensions allowed
 
+    # Set-based form of the settings above, built by utils.security on first use
+    _policy_cache: Any = PrivateAttr(default=None)
+
 
 class LanguageConfig(BaseModel):
     """Language-specific configuration."""
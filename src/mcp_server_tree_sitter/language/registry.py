@@ -2,7 +2,7 @@
 
 import logging
 import threading
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
 
 from tree_sitter_language_pack import get_language, get_parser
 
@@ -67,6 +67,9 @@ class LanguageRegistry:
             "ex": "elixir",
             "exs": "elixir",
         }
+        self._extensions_cache: Dict[str, FrozenSet[str]] = {}
+        # Names that failed to load, so repeated availability checks skip the probe
+        self._unavailable_languages: Set[str] = set()
 
     def preload_languages(self, config: ServerConfig) -> None:
         """
@@ -94,8 +97,34 @@ class LanguageRegistry:
         Returns:
             Language identifier or None if unknown
         """
-        ext = file_path.split(".")[-1].lower() if "." in file_path else ""
-        return self._language_map.get(ext)
+        # rpartition splits once at the last dot instead of at every dot
+        _, dot, ext = file_path.rpartition(".")
+        return self._language_map.get(ext.lower() if dot else "")
+
+    def extensions_for_language(self, language_name: str) -> FrozenSet[str]:
+        """
+        Get the file extensions mapped to a language.
+
+        Results are cached per language; call clear_extension_cache() after
+        changing the extension map.
+
+        Args:
+            language_name: Language identifier
+
+        Returns:
+            Set of extensions (without the leading dot)
+        """
+        with self._lock:
+            extensions = self._extensions_cache.get(language_name)
+            if extensions is None:
+                extensions = frozenset(ext for ext, lang in self._language_map.items() if lang == language_name)
+                self._extensions_cache[language_name] = extensions
+            return extensions
+
+    def clear_extension_cache(self) -> None:
+        """Invalidate cached extension lookups after the extension map changes."""
+        with self._lock:
+            self._extensions_cache.clear()
 
     def list_available_languages(self) -> List[str]:
         """
@@ -161,11 +190,18 @@ class LanguageRegistry:
         Returns:
             True if language is available
         """
-        try:
-            self.get_language(language_name)
-            return True
-        except Exception:
-            return False
+        with self._lock:
+            if language_name in self.languages:
+                return True
+            if language_name in self._unavailable_languages:
+                return False
+
+            try:
+                self.get_language(language_name)
+                return True
+            except Exception:
+                self._unavailable_languages.add(language_name)
+                return False
 
     def get_language(self, language_name: str) -> Any:
         """
@@ -91,18 +91,16 @@ def node_to_dict_cursor(
         if node_id in node_map:
             return node_map[node_id]
 
+        # Read each point once: every access builds a new tuple
+        start_row, start_column = current_node.start_point
+        end_row, end_column = current_node.end_point
+
         # Create node data
         node_data = {
             "id": node_id,
             "type": current_node.type,
-            "start_point": {
-                "row": current_node.start_point[0],
-                "column": current_node.start_point[1],
-            },
-            "end_point": {
-                "row": current_node.end_point[0],
-                "column": current_node.end_point[1],
-            },
+            "start_point": {"row": start_row, "column": start_column},
+            "end_point": {"row": end_row, "column": end_column},
             "start_byte": current_node.start_byte,
             "end_byte": current_node.end_byte,
             "named": current_node.is_named,
@@ -146,9 +144,11 @@ def node_to_dict_cursor(
                 # Process the child node
                 current_depth += 1
                 parent_stack.append(current_data)
-                # Ensure node is not None before processing
-                if cursor.node is not None:
-                    current_data = process_node(cursor.node, current_data, current_depth)
+                # Ensure node is not None before processing; cursor.node
+                # builds a new Node object on every access, so read it once
+                child = cursor.node
+                if child is not None:
+                    current_data = process_node(child, current_data, current_depth)
                 else:
                     visited_children = True
                 continue
@@ -159,8 +159,9 @@ def node_to_dict_cursor(
         # Try next sibling if children visited
         elif cursor.goto_next_sibling():
             # Ensure node is not None before processing
-            if cursor.node is not None:
-                current_data = process_node(cursor.node, parent_stack[-1], current_depth)
+            sibling = cursor.node
+            if sibling is not None:
+                current_data = process_node(sibling, parent_stack[-1], current_depth)
             else:
                 visited_children = True
             visited_children = False
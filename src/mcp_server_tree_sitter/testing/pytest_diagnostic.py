@@ -5,6 +5,7 @@ while maintaining standard test pass/fail behavior.
 """
 
 import json
+import os
 import time
 import traceback
 from json import JSONEncoder
@@ -163,11 +164,18 @@ def pytest_terminal_summary(terminalreporter: Any, exitstatus: Any, config: Any)
 
 def pytest_sessionfinish(session: Any, exitstatus: Any) -> None:
     """Generate JSON reports at the end of the test session."""
+    # Under pytest-xdist each worker collects its own diagnostics, so the
+    # controller has nothing to report and workers write separate files
+    worker_id = os.environ.get("PYTEST_XDIST_WORKER")
+    if worker_id is None and getattr(session.config.option, "numprocesses", None):
+        return
+
     output_dir = Path("diagnostic_results")
     output_dir.mkdir(exist_ok=True)
 
     timestamp = time.strftime("%Y%m%d_%H%M%S")
-    output_file = output_dir / f"diagnostic_results_{timestamp}.json"
+    suffix = f"_{worker_id}" if worker_id else ""
+    output_file = output_dir / f"diagnostic_results_{timestamp}{suffix}.json"
 
     # Convert diagnostics to JSON-serializable dict
     diagnostics_dict = {k: v.to_dict() for k, v in _DIAGNOSTICS.items()}
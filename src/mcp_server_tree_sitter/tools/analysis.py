@@ -7,16 +7,15 @@ from typing import Any, Dict, List, Optional, Set, Tuple
 from ..exceptions import SecurityError
 from ..language.query_templates import get_query_template
 from ..utils.context import MCPContext
-from ..utils.file_io import get_comment_prefix, read_text_file
+from ..utils.file_io import count_comment_lines, decode_lines, get_comment_prefix
 from ..utils.security import validate_file_access
 from ..utils.tree_sitter_helpers import (
     create_query,
-    ensure_language,
-    ensure_node,
     get_node_text,
     parse_with_cached_tree,
     query_captures,
 )
+from ..utils.tree_sitter_types import ensure_language, ensure_node
 
 
 def extract_symbols(
@@ -535,7 +534,7 @@ def analyze_project_structure(
     if scan_depth > 0:
         # Analyze a sample of files from each language
         for language, _ in languages.items():
-            extensions = [ext for ext, lang in language_registry._language_map.items() if lang == language]
+            extensions = sorted(language_registry.extensions_for_language(language))
 
             if not extensions:
                 continue
@@ -836,9 +835,9 @@ def analyze_code_complexity(
         # Parse with cached tree
         tree, source_bytes = parse_with_cached_tree(abs_path, language, safe_lang)
 
-        # Calculate basic metrics
-        # Read lines from file using utility
-        lines = read_text_file(abs_path)
+        # Calculate basic metrics from the parsed source, split once so every
+        # count uses the same lines and the file isn't read a second time
+        lines = decode_lines(source_bytes)
 
         line_count = len(lines)
         empty_lines = sum(1 for line in lines if line.strip() == "")
@@ -847,8 +846,7 @@ def analyze_code_complexity(
         # Language-specific comment detection using utility
         comment_prefix = get_comment_prefix(language)
         if comment_prefix:
-            # Count comments for text lines
-            comment_lines = sum(1 for line in lines if line.strip().startswith(comment_prefix))
+            comment_lines = count_comment_lines(lines, comment_prefix)
 
         # Get function and class definitions, excluding methods from count
         symbols = extract_symbols(
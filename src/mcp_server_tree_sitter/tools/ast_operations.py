@@ -90,10 +90,16 @@ def parse_file(file_path: Any, language: str, language_registry: Any, tree_cache
         return tree, bytes_data
 
     try:
+        source_bytes = read_binary_file(file_path)
+
+        # A file touched without changing its content keeps its cached tree
+        revalidated: Optional[tuple[Any, bytes]] = tree_cache.revalidate(file_path, language, source_bytes)
+        if revalidated:
+            return revalidated
+
         # Parse the file using helper
         parser = language_registry.get_parser(language)
         # Use source directly with parser to avoid parser vs. language confusion
-        source_bytes = read_binary_file(file_path)
         tree = parse_source(source_bytes, parser)
         result_tuple = (tree, source_bytes)
 
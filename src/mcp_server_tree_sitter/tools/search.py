@@ -1,12 +1,61 @@
 """Search tools for tree-sitter code analysis."""
 
 import concurrent.futures
+import itertools
+import os
 import re
+import threading
+from contextlib import closing
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Generator, Iterator, List, Optional, Pattern, Tuple, Union, cast
 
+from ..api import get_config
 from ..exceptions import QueryError, SecurityError
-from ..utils.security import validate_file_access
+from ..utils.fast_walk import compile_glob, walk
+from ..utils.security import validate_file_access, validate_files_bulk
+
+# Number of files queued per search worker thread
+_IN_FLIGHT_PER_WORKER = 4
+
+# Lines scanned between checks for a cancelled search
+_CANCEL_CHECK_LINES = 1024
+
+# Bytes read from the start of a file to detect binary content
+_BINARY_PROBE_SIZE = 8192
+
+# Extensions of files that are never searched as text
+_BINARY_EXTENSIONS = frozenset(
+    {
+        "png",
+        "jpg",
+        "jpeg",
+        "gif",
+        "bmp",
+        "ico",
+        "webp",
+        "pdf",
+        "zip",
+        "gz",
+        "tgz",
+        "bz2",
+        "xz",
+        "7z",
+        "jar",
+        "whl",
+        "so",
+        "o",
+        "a",
+        "dll",
+        "dylib",
+        "exe",
+        "class",
+        "pyc",
+        "pyo",
+        "wasm",
+        "pack",
+        "idx",
+    }
+)
 
 
 def search_text(
@@ -35,66 +84,97 @@ def search_text(
     Returns:
         List of matches with file, line number, and text
     """
-    root = project.root_path
-
-    results: List[Dict[str, Any]] = []
-    pattern_obj = None
-
-    # Prepare the pattern
+    # Prepare the pattern. Every mode is compiled to a regex so case-folding
+    # happens inside the regex engine instead of lowercasing each line.
+    flags = 0 if case_sensitive else re.IGNORECASE
     if use_regex:
         try:
-            flags = 0 if case_sensitive else re.IGNORECASE
             pattern_obj = re.compile(pattern, flags)
         except re.error as e:
             raise ValueError(f"Invalid regular expression: {e}") from e
     elif whole_word:
         # Escape pattern for use in regex and add word boundary markers
         pattern_escaped = re.escape(pattern)
-        flags = 0 if case_sensitive else re.IGNORECASE
         pattern_obj = re.compile(rf"\b{pattern_escaped}\b", flags)
-    elif not case_sensitive:
-        # For simple case-insensitive search
-        pattern = pattern.lower()
+    else:
+        # Plain substring search; surrounding whitespace in the pattern is
+        # ignored, as it always has been for literal searches
+        pattern_obj = re.compile(re.escape(pattern.strip()), flags)
 
-    file_pattern = file_pattern or "**/*"
+    file_regex = compile_glob(file_pattern) if file_pattern and file_pattern != "**/*" else None
 
-    # Process files in parallel
-    def process_file(file_path: Path) -> List[Dict[str, Any]]:
-        file_results = []
-        try:
-            validate_file_access(file_path, root)
+    # Stop consuming as soon as enough matches have been produced; closing
+    # the generator cancels files that are still queued
+    with closing(_iter_text_matches(project.root_path, pattern_obj, file_regex, max_results, context_lines)) as matches:
+        return list(itertools.islice(matches, max_results))
+
+
+def _iter_text_matches(
+    root: Path,
+    pattern_obj: Pattern[str],
+    file_regex: Optional[Pattern[str]],
+    max_results: int,
+    context_lines: int,
+) -> Generator[Dict[str, Any], None, None]:
+    """
+    Yield text search matches file by file as they are found.
+
+    Args:
+        root: Project root directory
+        pattern_obj: Compiled search pattern
+        file_regex: Optional compiled file pattern matched against relative paths
+        max_results: Maximum number of results to collect from a single file
+        context_lines: Number of context lines to include before/after matches
+
+    Yields:
+        Matches with file, line number, and text
+    """
+
+    # Read the config once for the whole scan rather than once per file
+    config = get_config()
 
-            with open(file_path, "r", encoding="utf-8", errors="replace") as f:
-                lines = f.readlines()
+    # Set once the consumer stops, so workers already mid-file bail out
+    cancel = threading.Event()
 
+    def process_file(file_path: Path) -> List[Dict[str, Any]]:
+        file_results: List[Dict[str, Any]] = []
+        if cancel.is_set():
+            return file_results
+        try:
+            validate_file_access(file_path, root, config)
+
+            with open(file_path, "rb") as f:
+                # Skip binary files cheaply, the way grep does: a NUL byte
+                # in the first block means the file isn't text
+                head = f.read(_BINARY_PROBE_SIZE)
+                if b"\0" in head:
+                    return file_results
+                text = (head + f.read()).decode("utf-8", errors="replace")
+
+            # Normalize line endings like universal newline mode, then split on
+            # newlines only so line numbers match readlines(), minus the
+            # trailing "\n" on every line
+            if "\r" in text:
+                text = text.replace("\r\n", "\n").replace("\r", "\n")
+            lines = text.split("\n")
+            if lines[-1] == "":
+                lines.pop()
+
+            search = pattern_obj.search
             for i, line in enumerate(lines, 1):
-                match = False
-
-                if pattern_obj:
-                    # Using regex pattern
-                    match_result = pattern_obj.search(line)
-                    match = bool(match_result)
-                elif case_sensitive:
-                    # Simple case-sensitive search - check both original and stripped versions
-                    match = pattern in line or pattern.strip() in line.strip()
-                else:
-                    # Simple case-insensitive search - check both original and stripped versions
-                    line_lower = line.lower()
-                    pattern_lower = pattern.lower()
-                    match = pattern_lower in line_lower or pattern_lower.strip() in line_lower.strip()
-
-                if match:
+                if i % _CANCEL_CHECK_LINES == 0 and cancel.is_set():
+                    break
+                if search(line):
                     # Calculate context lines
                     start = max(0, i - 1 - context_lines)
                     end = min(len(lines), i + context_lines)
 
                     context = []
                     for ctx_i in range(start, end):
-                        ctx_line = lines[ctx_i].rstrip("\n")
                         context.append(
                             {
                                 "line": ctx_i + 1,
-                                "text": ctx_line,
+                                "text": lines[ctx_i],
                                 "is_match": ctx_i == i - 1,
                             }
                         )
@@ -103,7 +183,7 @@ def search_text(
                         {
                             "file": str(file_path.relative_to(root)),
                             "line": i,
-                            "text": line.rstrip("\n"),
+                            "text": line,
                             "context": context,
                         }
                     )
@@ -116,24 +196,207 @@ def search_text(
 
         return file_results
 
-    # Collect files to process
-    files_to_process = []
-    for path in root.glob(file_pattern):
-        if path.is_file():
-            files_to_process.append(path)
-
-    # Process files in parallel
-    with concurrent.futures.ThreadPoolExecutor() as executor:
-        futures = [executor.submit(process_file, f) for f in files_to_process]
-        for future in concurrent.futures.as_completed(futures):
-            results.extend(future.result())
-            if len(results) >= max_results:
-                # Cancel any pending futures
-                for f in futures:
-                    f.cancel()
-                break
+    # Enumerate files lazily in a single pass, pruning excluded directories
+    root_str = os.fspath(root)
+    ignore_dirs = frozenset(config.security.excluded_dirs)
+
+    def iter_files() -> Iterator[Path]:
+        for path_str in walk(root_str, ignore_dirs=ignore_dirs):
+            if os.path.splitext(path_str)[1][1:].lower() in _BINARY_EXTENSIONS:
+                continue
+            if file_regex is not None:
+                rel_path = os.path.relpath(path_str, root_str).replace(os.sep, "/")
+                if not file_regex.match(rel_path):
+                    continue
+            yield Path(path_str)
+
+    # Process files in parallel with a bounded window of in-flight files, so
+    # huge projects don't queue a future (and its results) for every file
+    workers = min(32, (os.cpu_count() or 1) * 2)
+    files_to_process = iter_files()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        in_flight = {
+            executor.submit(process_file, f)
+            for f in itertools.islice(files_to_process, _IN_FLIGHT_PER_WORKER * workers)
+        }
+        try:
+            while in_flight:
+                done, in_flight = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+
+                    next_file = next(files_to_process, None)
+                    if next_file is not None:
+                        in_flight.add(executor.submit(process_file, next_file))
+        finally:
+            # Cancel any pending futures when the consumer stops early, and
+            # tell running workers to stop scanning
+            cancel.set()
+            for f in in_flight:
+                f.cancel()
+
+
+def _text_extractor(source_bytes: bytes) -> Callable[[Any], str]:
+    """
+    Build a node-text extractor for one source buffer.
+
+    Pure-ASCII sources are decoded once and sliced by byte offset, since byte
+    and character offsets coincide; other sources are decoded per node.
+
+    Args:
+        source_bytes: Source code as bytes
+
+    Returns:
+        Function mapping a node to its text
+    """
+    if source_bytes.isascii():
+        source_text = source_bytes.decode("ascii")
+        return lambda node: source_text[node.start_byte : node.end_byte]
+
+    from ..utils.tree_sitter_helpers import get_node_text
+
+    return lambda node: cast(str, get_node_text(node, source_bytes, decode=True))
 
-    return results[:max_results]
+
+def _iter_captures(captures: Any, capture_filter: Optional[str] = None) -> Iterator[Tuple[Any, str]]:
+    """
+    Normalize query captures into (node, capture_name) pairs.
+
+    The shape returned by query.captures() depends on the tree-sitter binding
+    version but is the same for every element, so it is detected once from
+    the first element instead of being re-checked for each capture.
+
+    Args:
+        captures: Result of query_captures()
+        capture_filter: Optional capture name to keep; other captures are skipped
+
+    Returns:
+        Iterator of (node, capture_name) tuples
+    """
+    if isinstance(captures, dict):
+        # Dictionary format: {capture_name: [node1, node2, ...], ...}
+        if capture_filter:
+            # Only the requested group needs to be visited at all
+            return ((node, capture_filter) for node in captures.get(capture_filter, ()))
+        return ((node, capture_name) for capture_name, nodes in captures.items() for node in nodes)
+
+    # List format: [(node1, capture_name1), (node2, capture_name2), ...]
+    iterator = iter(captures)
+    first = next(iterator, None)
+    if first is None:
+        return iter(())
+    matches = itertools.chain([first], iterator)
+
+    if isinstance(first, tuple) and len(first) == 2:
+        # Direct tuples
+        pairs = cast(Iterator[Tuple[Any, str]], matches)
+    elif hasattr(first, "node") and hasattr(first, "capture_name"):
+        # Objects with node and capture_name attributes
+        pairs = ((match.node, match.capture_name) for match in matches)
+    elif isinstance(first, dict) and "node" in first and "capture" in first:
+        # Dictionaries with node and capture keys
+        pairs = ((match["node"], match["capture"]) for match in matches)
+    else:
+        # Unknown format
+        return iter(())
+
+    if capture_filter:
+        return (pair for pair in pairs if pair[1] == capture_filter)
+    return pairs
+
+
+def _extract_text(node_text: Callable[[Any], str], node: Any) -> str:
+    """Extract node text, tolerating nodes whose text cannot be decoded."""
+    try:
+        return node_text(node)
+    except Exception:
+        return "<binary data>"
+
+
+def _query_one_file(
+    abs_path: Union[str, Path],
+    rel_path: str,
+    language: str,
+    query: Any,
+    language_registry: Any,
+    tree_cache: Any,
+    max_results: Optional[int],
+    include_snippets: bool,
+    capture_filter: Optional[str],
+    compact: bool,
+) -> List[Dict[str, Any]]:
+    """
+    Run an already compiled query against a single file.
+
+    The caller is responsible for resolving the path and validating access.
+
+    Args:
+        abs_path: Absolute path of the file
+        rel_path: Path relative to the project root, reported in results
+        language: Language of the file
+        query: Compiled tree-sitter query
+        language_registry: Language registry
+        tree_cache: Tree cache instance
+        max_results: Maximum number of results to return
+        include_snippets: Whether to include code snippets in results
+        capture_filter: Optional capture name to keep
+        compact: Whether to return only capture names and text
+
+    Returns:
+        List of query matches
+    """
+    from ..utils.tree_sitter_helpers import query_captures
+
+    # Check if we have a cached tree
+    cached = tree_cache.get(abs_path, language)
+    if cached:
+        tree, source_bytes = cached
+    else:
+        # Parse file
+        with open(abs_path, "rb") as f:
+            source_bytes = f.read()
+
+        parser = language_registry.get_parser(language)
+        tree = parser.parse(source_bytes)
+
+        # Cache the tree
+        tree_cache.put(abs_path, language, tree, source_bytes)
+
+    captures = query_captures(query, tree.root_node)
+
+    # Only pay for text extraction when the results include it
+    node_text = _text_extractor(source_bytes) if include_snippets or compact else None
+
+    results: List[Dict[str, Any]] = []
+
+    # Normalize the capture format once, outside the per-capture loop.
+    # query.captures() already applies predicates such as #eq? and #match?.
+    for node, capture_name in _iter_captures(captures, capture_filter):
+        # Skip if we've reached max results
+        if max_results is not None and len(results) >= max_results:
+            break
+
+        text = _extract_text(node_text, node) if node_text is not None else None
+
+        if compact:
+            result: Dict[str, Any] = {"capture": capture_name, "text": text}
+        else:
+            # Each point access builds a new Point in the binding, so
+            # read start and end once per node
+            start_row, start_column = node.start_point
+            end_row, end_column = node.end_point
+            result = {
+                "file": rel_path,
+                "capture": capture_name,
+                "start": {"row": start_row, "column": start_column},
+                "end": {"row": end_row, "column": end_column},
+            }
+            if include_snippets:
+                result["text"] = text
+
+        results.append(result)
+
+    return results
 
 
 def query_code(
@@ -164,8 +427,9 @@ def query_code(
     Returns:
         List of query matches
     """
+    from ..utils.tree_sitter_helpers import create_query
+
     root = project.root_path
-    results: List[Dict[str, Any]] = []
 
     if file_path is not None:
         # Query a specific file
@@ -185,168 +449,70 @@ def query_code(
                 raise QueryError(f"Could not detect language for {file_path}")
 
         try:
-            # Check if we have a cached tree
-            assert language is not None  # For type checking
-            cached = tree_cache.get(abs_path, language)
-            if cached:
-                tree, source_bytes = cached
-            else:
-                # Parse file
-                with open(abs_path, "rb") as f:
-                    source_bytes = f.read()
-
-                parser = language_registry.get_parser(language)
-                tree = parser.parse(source_bytes)
-
-                # Cache the tree
-                tree_cache.put(abs_path, language, tree, source_bytes)
-
-            # Execute query
-            lang = language_registry.get_language(language)
-
-            from ..utils.tree_sitter_helpers import create_query, query_captures
-
-            query = create_query(lang, query_string)
-
-            captures = query_captures(query, tree.root_node)
-
-            # Handle different return formats from query.captures()
-            if isinstance(captures, dict):
-                # Dictionary format: {capture_name: [node1, node2, ...], ...}
-                for capture_name, nodes in captures.items():
-                    if capture_filter and capture_name != capture_filter:
-                        continue
-
-                    for node in nodes:
-                        # Skip if we've reached max results
-                        if max_results is not None and len(results) >= max_results:
-                            break
-
-                        try:
-                            from ..utils.tree_sitter_helpers import get_node_text
-
-                            text = get_node_text(node, source_bytes, decode=True)
-                        except Exception:
-                            text = "<binary data>"
-
-                        if compact:
-                            result: Dict[str, Any] = {"capture": capture_name, "text": text}
-                        else:
-                            result = {
-                                "file": file_path,
-                                "capture": capture_name,
-                                "start": {
-                                    "row": node.start_point[0],
-                                    "column": node.start_point[1],
-                                },
-                                "end": {
-                                    "row": node.end_point[0],
-                                    "column": node.end_point[1],
-                                },
-                            }
-                            if include_snippets:
-                                result["text"] = text
+            query = create_query(language_registry.get_language(language), query_string)
+            return _query_one_file(
+                abs_path,
+                file_path,
+                language,
+                query,
+                language_registry,
+                tree_cache,
+                max_results,
+                include_snippets,
+                capture_filter,
+                compact,
+            )
+        except Exception as e:
+            raise QueryError(f"Error querying {file_path}: {e}") from e
 
-                        results.append(result)
-            else:
-                # List format: [(node1, capture_name1), (node2, capture_name2), ...]
-                for match in captures:
-                    # Handle different return types from query.captures()
-                    if isinstance(match, tuple) and len(match) == 2:
-                        # Direct tuple unpacking
-                        node, capture_name = match
-                    elif hasattr(match, "node") and hasattr(match, "capture_name"):
-                        # Object with node and capture_name attributes
-                        node, capture_name = match.node, match.capture_name
-                    elif isinstance(match, dict) and "node" in match and "capture" in match:
-                        # Dictionary with node and capture keys
-                        node, capture_name = match["node"], match["capture"]
-                    else:
-                        # Skip if format is unknown
-                        continue
-
-                    if capture_filter and capture_name != capture_filter:
-                        continue
-
-                    # Skip if we've reached max results
-                    if max_results is not None and len(results) >= max_results:
-                        break
+    # Query across multiple files
+    if not language:
+        raise QueryError("Language is required when file_path is not provided")
 
-                    try:
-                        from ..utils.tree_sitter_helpers import get_node_text
-
-                        text = get_node_text(node, source_bytes, decode=True)
-                    except Exception:
-                        text = "<binary data>"
-
-                    if compact:
-                        result = {"capture": capture_name, "text": text}
-                    else:
-                        result = {
-                            "file": file_path,
-                            "capture": capture_name,
-                            "start": {
-                                "row": node.start_point[0],
-                                "column": node.start_point[1],
-                            },
-                            "end": {"row": node.end_point[0], "column": node.end_point[1]},
-                        }
-                        if include_snippets:
-                            result["text"] = text
+    # Find all matching files for the language
+    extensions = language_registry.extensions_for_language(language)
 
-                    results.append(result)
-        except Exception as e:
-            raise QueryError(f"Error querying {file_path}: {e}") from e
-    else:
-        # Query across multiple files
-        if not language:
-            raise QueryError("Language is required when file_path is not provided")
+    if not extensions:
+        raise QueryError(f"No file extensions found for language {language}")
 
-        # Find all matching files for the language
-        extensions = [(ext, lang) for ext, lang in language_registry._language_map.items() if lang == language]
+    # Resolve the language, compile the query and resolve the project root
+    # once instead of repeating the work for every file
+    try:
+        query = create_query(language_registry.get_language(language), query_string)
+    except Exception as e:
+        raise QueryError(f"Error compiling query for {language}: {e}") from e
 
-        if not extensions:
-            raise QueryError(f"No file extensions found for language {language}")
+    root_str = os.fspath(Path(root).resolve())
+    config = get_config()
+    ignore_dirs = frozenset(config.security.excluded_dirs)
 
-        # Process files in parallel
-        def process_file(rel_path: str) -> List[Dict[str, Any]]:
+    def iter_matches() -> Iterator[Dict[str, Any]]:
+        produced = 0
+        for path in walk(root_str, extensions, ignore_dirs):
+            remaining = None if max_results is None else max_results - produced
             try:
-                # Use single-file version of query_code
-                file_results = query_code(
-                    project,
-                    query_string,
+                validate_file_access(path, root_str, config)
+                file_results = _query_one_file(
+                    path,
+                    Path(os.path.relpath(path, root_str)).as_posix(),
+                    language,
+                    query,
                     language_registry,
                     tree_cache,
-                    rel_path,
-                    language,
-                    max_results if max_results is None else max_results - len(results),
+                    remaining,
                     include_snippets,
+                    capture_filter,
+                    compact,
                 )
-                return file_results
             except Exception:
                 # Skip files that can't be queried
-                return []
-
-        # Collect files to process
-        files_to_process = []
-        for ext, _ in extensions:
-            for path in root.glob(f"**/*.{ext}"):
-                if path.is_file():
-                    files_to_process.append(str(path.relative_to(root)))
-
-        # Process files until we reach max_results
-        for file in files_to_process:
-            try:
-                file_results = process_file(file)
-                results.extend(file_results)
-
-                if max_results is not None and len(results) >= max_results:
-                    break
-            except Exception:
-                # Skip files that cause errors
                 continue
+            produced += len(file_results)
+            yield from file_results
 
-    return results[:max_results] if max_results is not None else results
+    # Walk the project once, filtered by extension, and stop as soon as
+    # max_results matches have been collected
+    return list(itertools.islice(iter_matches(), max_results))
 
 
 def _extract_ast_fingerprint(node: Any, source_bytes: bytes) -> set:
@@ -445,57 +611,55 @@ def find_similar_code(
     results: List[Dict[str, Any]] = []
 
     # Find files for this language
-    extensions = [ext for ext, lang in language_registry._language_map.items() if lang == language]
+    extensions = language_registry.extensions_for_language(language)
     if not extensions:
         raise QueryError(f"No file extensions found for language {language}")
 
-    for ext in extensions:
-        for file_path in root.glob(f"**/*.{ext}"):
-            if not file_path.is_file():
-                continue
+    config = get_config()
+    ignore_dirs = frozenset(config.security.excluded_dirs)
 
-            rel_path = str(file_path.relative_to(root))
+    # Every candidate file is compared, so validate them all in one batch
+    for file_path in validate_files_bulk(walk(root, extensions, ignore_dirs), root, config):
+        rel_path = str(file_path.relative_to(root))
 
-            try:
-                validate_file_access(file_path, root)
-
-                # Parse file
-                cached = tree_cache.get(file_path, language)
-                if cached:
-                    tree, source_bytes = cached
-                else:
-                    with open(file_path, "rb") as f:
-                        source_bytes = f.read()
-                    tree = parser.parse(source_bytes)
-                    tree_cache.put(file_path, language, tree, source_bytes)
-
-                # Compare each top-level block against the snippet
-                for block in _iter_top_level_blocks(tree):
-                    block_fp = _extract_ast_fingerprint(block, source_bytes)
-                    if not block_fp:
-                        continue
-
-                    # Containment similarity: what fraction of the snippet's
-                    # fingerprint is found in the candidate block. This handles
-                    # asymmetric sizes well — a short snippet can match a long
-                    # function if the snippet's structure is contained within it.
-                    intersection = len(snippet_fp & block_fp)
-                    similarity = intersection / len(snippet_fp) if snippet_fp else 0.0
-
-                    if similarity >= threshold:
-                        block_text = source_bytes[block.start_byte : block.end_byte].decode("utf-8", errors="replace")
-                        results.append(
-                            {
-                                "file": rel_path,
-                                "start": {"row": block.start_point[0], "column": block.start_point[1]},
-                                "end": {"row": block.end_point[0], "column": block.end_point[1]},
-                                "similarity": round(similarity, 3),
-                                "node_type": block.type,
-                                "text": block_text[:500],
-                            }
-                        )
-            except (SecurityError, Exception):
-                continue
+        try:
+            # Parse file
+            cached = tree_cache.get(file_path, language)
+            if cached:
+                tree, source_bytes = cached
+            else:
+                with open(file_path, "rb") as f:
+                    source_bytes = f.read()
+                tree = parser.parse(source_bytes)
+                tree_cache.put(file_path, language, tree, source_bytes)
+
+            # Compare each top-level block against the snippet
+            for block in _iter_top_level_blocks(tree):
+                block_fp = _extract_ast_fingerprint(block, source_bytes)
+                if not block_fp:
+                    continue
+
+                # Containment similarity: what fraction of the snippet's
+                # fingerprint is found in the candidate block. This handles
+                # asymmetric sizes well — a short snippet can match a long
+                # function if the snippet's structure is contained within it.
+                intersection = len(snippet_fp & block_fp)
+                similarity = intersection / len(snippet_fp) if snippet_fp else 0.0
+
+                if similarity >= threshold:
+                    block_text = source_bytes[block.start_byte : block.end_byte].decode("utf-8", errors="replace")
+                    results.append(
+                        {
+                            "file": rel_path,
+                            "start": {"row": block.start_point[0], "column": block.start_point[1]},
+                            "end": {"row": block.end_point[0], "column": block.end_point[1]},
+                            "similarity": round(similarity, 3),
+                            "node_type": block.type,
+                            "text": block_text[:500],
+                        }
+                    )
+        except (SecurityError, Exception):
+            continue
 
     results.sort(key=lambda x: x["similarity"], reverse=True)
     return results[:max_results]
@@ -1,6 +1,7 @@
 """Context handling for MCP operations with progress reporting."""
 
 import logging
+import time
 from contextlib import contextmanager
 from typing import Any, Generator, Optional, TypeVar
 
@@ -8,6 +9,9 @@ logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
+# Minimum seconds between intermediate progress reports
+PROGRESS_MIN_INTERVAL = 0.05
+
 
 class ProgressScope:
     """Scope for tracking progress of an operation."""
@@ -62,11 +66,17 @@ class MCPContext:
         self.ctx = ctx
         self.total_steps = 0
         self.current_step = 0
+        self._last_report_time: Optional[float] = None
 
     def report_progress(self, current: int, total: int) -> None:
         """
         Report progress to the MCP client.
 
+        Intermediate updates are throttled: one is only sent when at least
+        PROGRESS_MIN_INTERVAL seconds have passed since the last report or
+        progress lands on a whole percent. The first and final updates are
+        always sent.
+
         Args:
             current: Current progress value
             total: Total steps
@@ -74,6 +84,16 @@ class MCPContext:
         self.current_step = current
         self.total_steps = total
 
+        now = time.monotonic()
+        if (
+            self._last_report_time is not None
+            and current < total
+            and now - self._last_report_time < PROGRESS_MIN_INTERVAL
+            and current % max(1, total // 100) != 0
+        ):
+            return
+        self._last_report_time = now
+
         if self.ctx and hasattr(self.ctx, "report_progress"):
             # Use MCP context if available
             try:
@@ -82,7 +102,7 @@ class MCPContext:
                 logger.warning(f"Failed to report progress: {e}")
         else:
             # Log progress if no MCP context
-            if total > 0:
+            if total > 0 and logger.isEnabledFor(logging.DEBUG):
                 percentage = int((current / total) * 100)
                 logger.debug(f"Progress: {percentage}% ({current}/{total})")
 
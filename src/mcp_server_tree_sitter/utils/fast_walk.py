@@ -0,0 +1,110 @@
+"""Fast directory traversal for project-wide file scans.
+
+This module provides an ``os.scandir``-based walker that avoids the
+per-entry ``stat`` calls and ``Path`` construction performed by
+``Path.glob("**/*")``, prunes ignored directories before descending into
+them, and optionally filters by file extension in the same pass.
+"""
+
+import os
+import re
+from pathlib import Path
+from typing import AbstractSet, Iterator, Optional, Pattern, Union
+
+DEFAULT_IGNORE_DIRS = frozenset({".git", "node_modules", "__pycache__", "target", "dist", "build"})
+
+
+def walk(
+    root: Union[str, Path],
+    exts: Optional[AbstractSet[str]] = None,
+    ignore_dirs: AbstractSet[str] = DEFAULT_IGNORE_DIRS,
+) -> Iterator[str]:
+    """
+    Yield paths of regular files below a directory.
+
+    Args:
+        root: Directory to walk
+        exts: Optional set of extensions (without the leading dot) to keep
+        ignore_dirs: Directory names that are never descended into
+
+    Returns:
+        Iterator of file paths as strings, joined onto ``root``
+    """
+    stack = [os.fspath(root)]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in ignore_dirs:
+                                stack.append(entry.path)
+                            continue
+                        if not entry.is_file():
+                            continue
+                    except OSError:
+                        continue
+
+                    if exts is not None:
+                        name = entry.name
+                        dot = name.rfind(".")
+                        if dot < 0 or name[dot + 1 :] not in exts:
+                            continue
+
+                    yield entry.path
+        except OSError:
+            # Skip directories that vanish or can't be listed
+            continue
+
+
+def compile_glob(pattern: str) -> Pattern[str]:
+    """
+    Compile a pathlib-style glob pattern into a regular expression.
+
+    The returned pattern matches POSIX-style paths relative to the walk root.
+    ``*`` and ``?`` never cross a ``/``, while a ``**`` segment matches zero
+    or more whole directories, mirroring ``Path.glob`` semantics.
+
+    Args:
+        pattern: Glob pattern (e.g. "**/*.py" or "src/*.js")
+
+    Returns:
+        Compiled regular expression
+    """
+    segments = [segment for segment in pattern.replace("\\", "/").split("/") if segment]
+    parts = []
+    for i, segment in enumerate(segments):
+        last = i == len(segments) - 1
+        if segment == "**":
+            parts.append(".*" if last else "(?:[^/]*/)*")
+            continue
+        parts.append(_translate_segment(segment) + ("" if last else "/"))
+    return re.compile("".join(parts) + r"\Z")
+
+
+def _translate_segment(segment: str) -> str:
+    """Translate a single glob path segment into a regular expression."""
+    result = []
+    i = 0
+    n = len(segment)
+    while i < n:
+        char = segment[i]
+        i += 1
+        if char == "*":
+            result.append("[^/]*")
+        elif char == "?":
+            result.append("[^/]")
+        elif char == "[":
+            end = segment.find("]", i + 1 if i < n and segment[i] in "!]" else i)
+            if end < 0:
+                result.append(re.escape(char))
+                continue
+            body = segment[i:end].replace("\\", "\\\\")
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            result.append(f"[{body}]")
+            i = end + 1
+        else:
+            result.append(re.escape(char))
+    return "".join(result)
@@ -4,9 +4,37 @@ This module provides safe file I/O operations with proper encoding handling
 and consistent interfaces for both text and binary operations.
 """
 
+import io
+import itertools
+import os
 from pathlib import Path
 from typing import List, Optional, Tuple, Union
 
+# Line comment prefixes by language
+_COMMENT_STARTERS = {
+    "python": "#",
+    "javascript": "//",
+    "typescript": "//",
+    "java": "//",
+    "c": "//",
+    "cpp": "//",
+    "go": "//",
+    "ruby": "#",
+    "rust": "//",
+    "php": "//",
+    "swift": "//",
+    "kotlin": "//",
+    "scala": "//",
+    "bash": "#",
+    "shell": "#",
+    "yaml": "#",
+    "html": "<!--",
+    "css": "/*",
+    "scss": "//",
+    "sass": "//",
+    "sql": "--",
+}
+
 
 def read_text_file(path: Union[str, Path]) -> List[str]:
     """
@@ -32,8 +60,25 @@ def read_binary_file(path: Union[str, Path]) -> bytes:
     Returns:
         File contents as bytes
     """
-    with open(str(path), "rb") as f:
-        return f.read()
+    # Read through a raw file descriptor: a whole-file read gains nothing
+    # from a BufferedReader, which would only add a buffer and an extra copy
+    fd = os.open(os.fspath(path), os.O_RDONLY | getattr(os, "O_BINARY", 0) | getattr(os, "O_CLOEXEC", 0))
+    try:
+        size = os.fstat(fd).st_size
+        data = os.read(fd, size) if size > 0 else b""
+        if len(data) < size or size == 0:
+            # Short read, or a file whose size isn't known up front (e.g. in
+            # /proc): keep reading until EOF
+            chunks = [data]
+            while True:
+                chunk = os.read(fd, max(size, 65536))
+                if not chunk:
+                    break
+                chunks.append(chunk)
+            data = b"".join(chunks)
+        return data
+    finally:
+        os.close(fd)
 
 
 def get_file_content_and_lines(path: Union[str, Path]) -> Tuple[bytes, List[str]]:
@@ -47,8 +92,24 @@ def get_file_content_and_lines(path: Union[str, Path]) -> Tuple[bytes, List[str]
         Tuple of (binary_content, text_lines)
     """
     binary_content = read_binary_file(path)
-    text_lines = read_text_file(path)
-    return binary_content, text_lines
+    return binary_content, decode_lines(binary_content)
+
+
+def decode_lines(content: bytes, encoding: str = "utf-8") -> List[str]:
+    """
+    Decode file content into lines, as read_text_file() would return them.
+
+    Universal newlines apply: \\r\\n and \\r become \\n, and only those
+    end a line, unlike str.splitlines() which also splits on \\f, \\v and others.
+
+    Args:
+        content: File content as bytes
+        encoding: Text encoding to use
+
+    Returns:
+        List of lines with universal-newline endings
+    """
+    return io.StringIO(content.decode(encoding, errors="replace"), newline=None).readlines()
 
 
 def is_line_comment(line: str, comment_prefix: str) -> bool:
@@ -89,38 +150,16 @@ def get_comment_prefix(language: str) -> Optional[str]:
     Returns:
         Comment prefix or None if unknown
     """
-    # Language-specific comment detection
-    comment_starters = {
-        "python": "#",
-        "javascript": "//",
-        "typescript": "//",
-        "java": "//",
-        "c": "//",
-        "cpp": "//",
-        "go": "//",
-        "ruby": "#",
-        "rust": "//",
-        "php": "//",
-        "swift": "//",
-        "kotlin": "//",
-        "scala": "//",
-        "bash": "#",
-        "shell": "#",
-        "yaml": "#",
-        "html": "<!--",
-        "css": "/*",
-        "scss": "//",
-        "sass": "//",
-        "sql": "--",
-    }
-
-    return comment_starters.get(language)
+    return _COMMENT_STARTERS.get(language)
 
 
 def parse_file_with_encoding(path: Union[str, Path], encoding: str = "utf-8") -> Tuple[bytes, List[str]]:
     """
     Parse a file with explicit encoding handling, returning both binary and text.
 
+    Lines are split with universal newlines, as read_text_file() does:
+    \r\n and \r line endings are returned as \n.
+
     Args:
         path: Path to the file
         encoding: Text encoding to use
@@ -129,12 +168,7 @@ def parse_file_with_encoding(path: Union[str, Path], encoding: str = "utf-8") ->
         Tuple of (binary_content, decoded_lines)
     """
     binary_content = read_binary_file(path)
-
-    # Now decode the binary content with the specified encoding
-    text = binary_content.decode(encoding, errors="replace")
-    lines = text.splitlines(True)  # Keep line endings
-
-    return binary_content, lines
+    return binary_content, decode_lines(binary_content, encoding)
 
 
 def read_file_lines(path: Union[str, Path], start_line: int = 0, max_lines: Optional[int] = None) -> List[str]:
@@ -150,12 +184,5 @@ def read_file_lines(path: Union[str, Path], start_line: int = 0, max_lines: Opti
         List of requested lines
     """
     with open(str(path), "r", encoding="utf-8", errors="replace") as f:
-        # Skip lines before start_line
-        for _ in range(start_line):
-            next(f, None)
-
-        # Read up to max_lines
-        if max_lines is not None:
-            return [f.readline() for _ in range(max_lines)]
-        else:
-            return f.readlines()
+        stop = None if max_lines is None else start_line + max_lines
+        return list(itertools.islice(f, start_line, stop))
@@ -4,6 +4,20 @@ import os
 from pathlib import Path
 from typing import Union
 
+# Files and directories that indicate the root of a project
+_PROJECT_MARKERS = frozenset(
+    {
+        ".git",
+        "pyproject.toml",
+        "setup.py",
+        "package.json",
+        "Cargo.toml",
+        "CMakeLists.txt",
+        ".svn",
+        "Makefile",
+    }
+)
+
 
 def normalize_path(path: Union[str, Path], ensure_absolute: bool = False) -> Path:
     """
@@ -41,13 +55,11 @@ def safe_relative_path(path: Union[str, Path], base: Union[str, Path]) -> Path:
     base_path = normalize_path(base)
     target_path = normalize_path(path)
 
-    # Ensure target is within base
+    # Ensure target is within base. Both paths are resolved, so the relative
+    # path can never contain ".." components: relative_to() raising is the
+    # only way an escape shows up.
     try:
-        relative = target_path.relative_to(base_path)
-        # Check for directory traversal
-        if ".." in str(relative).split(os.sep):
-            raise ValueError(f"Path contains forbidden directory traversal: {path}")
-        return relative
+        return target_path.relative_to(base_path)
     except ValueError as e:
         raise ValueError(f"Path {path} is not within base directory {base}") from e
 
@@ -68,24 +80,16 @@ def get_project_root(path: Union[str, Path]) -> Path:
     if path_obj.is_file():
         path_obj = path_obj.parent
 
-    # Look for common project indicators
-    markers = [
-        ".git",
-        "pyproject.toml",
-        "setup.py",
-        "package.json",
-        "Cargo.toml",
-        "CMakeLists.txt",
-        ".svn",
-        "Makefile",
-    ]
-
-    # Start from path and go up directories until a marker is found
+    # Start from path and go up directories until a marker is found. One
+    # directory listing per level replaces a stat call per marker.
     current = path_obj
     while current != current.parent:  # Stop at filesystem root
-        for marker in markers:
-            if (current / marker).exists():
-                return current
+        try:
+            with os.scandir(current) as entries:
+                if any(entry.name in _PROJECT_MARKERS for entry in entries):
+                    return current
+        except OSError:
+            pass
         current = current.parent
 
     # If no marker found, return original directory
@@ -1,55 +1,187 @@
 """Security utilities for mcp-server-tree-sitter."""
 
 import logging
+import os
+import stat
 from pathlib import Path
-from typing import Union
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Union
 
 from ..api import get_config
+from ..config import ServerConfig
 from ..exceptions import SecurityError
 
+logger = logging.getLogger(__name__)
 
-def validate_file_access(file_path: Union[str, Path], project_root: Union[str, Path]) -> None:
+
+class _SecurityPolicy(NamedTuple):
+    """Security settings converted to sets for fast membership tests."""
+
+    excluded_dirs: FrozenSet[str]
+    allowed_extensions: Optional[FrozenSet[str]]
+
+
+def _policy_for(config: ServerConfig) -> _SecurityPolicy:
+    """
+    Get the set-based policy for the current security settings of a config.
+
+    The policy is cached on the config's security object together with copies
+    of the settings it was built from, so it is rebuilt only when they change,
+    whether by assignment or by mutating the lists in place.
+    """
+    security = config.security
+    excluded_dirs = security.excluded_dirs
+    allowed_extensions = security.allowed_extensions
+
+    cached = security._policy_cache
+    if cached is not None and cached[0] == excluded_dirs and cached[1] == allowed_extensions:
+        policy: _SecurityPolicy = cached[2]
+        return policy
+
+    policy = _SecurityPolicy(
+        frozenset(excluded_dirs),
+        frozenset(allowed_extensions) if allowed_extensions else None,
+    )
+    security._policy_cache = (
+        list(excluded_dirs),
+        list(allowed_extensions) if allowed_extensions is not None else None,
+        policy,
+    )
+    return policy
+
+
+def validate_file_access(
+    file_path: Union[str, Path], project_root: Union[str, Path], config: Optional[ServerConfig] = None
+) -> None:
     """
     Validate a file can be safely accessed.
 
     Args:
         file_path: Path to validate
         project_root: Project root directory
+        config: Server configuration to validate against; batch callers can
+                fetch it once and pass it in (defaults to the current config)
 
     Raises:
         SecurityError: If path fails validation
     """
-    # Always get a fresh config for each validation
-    config = get_config()
-    logger = logging.getLogger(__name__)
+    if config is None:
+        config = get_config()
+
+    security = config.security
+    policy = _policy_for(config)
 
     path_obj = Path(file_path)
-    root_obj = Path(project_root)
+
+    # Check file extension if restriction is enabled. This only needs the
+    # name, so it runs before the filesystem work done by resolve().
+    if policy.allowed_extensions and path_obj.suffix.lower()[1:] not in policy.allowed_extensions:
+        raise SecurityError(f"File type not allowed: {path_obj.suffix}")
 
     # Normalize paths to prevent directory traversal
     try:
         normalized_path = path_obj.resolve()
-        normalized_root = root_obj.resolve()
+        normalized_root = Path(project_root).resolve()
     except (ValueError, OSError) as e:
         raise SecurityError(f"Invalid path: {e}") from e
 
-    # Check if path is inside project root
-    if not str(normalized_path).startswith(str(normalized_root)):
+    # Check if path is inside project root. This compares whole path
+    # components, so a sibling like /project-other is not inside /project.
+    if not normalized_path.is_relative_to(normalized_root):
         raise SecurityError(f"Access denied: {file_path} is outside project root")
 
     # Check excluded directories
-    for excluded in config.security.excluded_dirs:
-        if excluded in normalized_path.parts:
-            raise SecurityError(f"Access denied to excluded directory: {excluded}")
-
-    # Check file extension if restriction is enabled
-    if config.security.allowed_extensions and path_obj.suffix.lower()[1:] not in config.security.allowed_extensions:
-        raise SecurityError(f"File type not allowed: {path_obj.suffix}")
+    if not policy.excluded_dirs.isdisjoint(normalized_path.parts):
+        excluded = next(e for e in security.excluded_dirs if e in normalized_path.parts)
+        raise SecurityError(f"Access denied to excluded directory: {excluded}")
 
     # Check file size if it exists
     if normalized_path.exists() and normalized_path.is_file():
         file_size_mb = normalized_path.stat().st_size / (1024 * 1024)
-        max_file_size_mb = config.security.max_file_size_mb
+        max_file_size_mb = security.max_file_size_mb
         logger.debug(f"File size check: {file_size_mb:.2f}MB, limit: {max_file_size_mb}MB")
         if file_size_mb > max_file_size_mb:
             raise SecurityError(f"File too large: {file_size_mb:.2f}MB exceeds limit of {max_file_size_mb}MB")
+
+
+def validate_files_bulk(
+    file_paths: Iterable[Union[str, Path]], project_root: Union[str, Path], config: Optional[ServerConfig] = None
+) -> List[Path]:
+    """
+    Validate many files at once, keeping only those that can be accessed.
+
+    Applies the same checks as validate_file_access, but resolves the project
+    root and each parent directory only once instead of resolving every path
+    component of every file.
+
+    Args:
+        file_paths: Paths to validate
+        project_root: Project root directory
+        config: Server configuration to validate against (defaults to the current config)
+
+    Returns:
+        Paths that passed validation, in input order
+    """
+    if config is None:
+        config = get_config()
+
+    policy = _policy_for(config)
+    max_file_size = config.security.max_file_size_mb * 1024 * 1024
+
+    try:
+        root_str = str(Path(project_root).resolve())
+    except (ValueError, OSError):
+        return []
+    root_prefix = root_str if root_str.endswith(os.sep) else root_str + os.sep
+
+    # Resolved parent directory -> None if the directory itself is rejected
+    parents: Dict[str, Optional[str]] = {}
+    valid: List[Path] = []
+
+    for file_path in file_paths:
+        path_str = os.fspath(file_path)
+        parent, name = os.path.split(path_str)
+
+        if policy.allowed_extensions is not None:
+            suffix = os.path.splitext(name)[1].lower()[1:]
+            if suffix not in policy.allowed_extensions:
+                continue
+
+        try:
+            if name in ("", ".", "..") or os.path.islink(path_str):
+                # The name itself changes on resolution; resolve it fully
+                normalized = os.path.realpath(path_str)
+                if not _parent_allowed(os.path.dirname(normalized), root_str, root_prefix, policy):
+                    continue
+                name = os.path.basename(normalized)
+            else:
+                if parent not in parents:
+                    real = os.path.realpath(parent or os.curdir)
+                    parents[parent] = real if _parent_allowed(real, root_str, root_prefix, policy) else None
+                parent_real = parents[parent]
+                if parent_real is None:
+                    continue
+                normalized = os.path.join(parent_real, name)
+
+            if name in policy.excluded_dirs:
+                continue
+
+            try:
+                st = os.stat(normalized)
+            except FileNotFoundError:
+                st = None
+            if st is not None and stat.S_ISREG(st.st_mode) and st.st_size > max_file_size:
+                continue
+        except (ValueError, OSError) as e:
+            logger.debug(f"Skipping {path_str}: {e}")
+            continue
+
+        valid.append(Path(file_path))
+
+    return valid
+
+
+def _parent_allowed(parent_real: str, root_str: str, root_prefix: str, policy: _SecurityPolicy) -> bool:
+    """Check that a resolved directory is inside the root and not excluded."""
+    if parent_real != root_str and not parent_real.startswith(root_prefix):
+        return False
+    return policy.excluded_dirs.isdisjoint(Path(parent_real).parts)
@@ -4,8 +4,12 @@ This module provides wrappers and utility functions for common tree-sitter opera
 to ensure type safety and consistent handling of tree-sitter objects.
 """
 
+import functools
+import os
+import sys
+import threading
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union, cast
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple, TypeVar, Union, cast
 
 # Import tree_cache at runtime as needed to avoid circular imports
 from ..utils.file_io import read_binary_file
@@ -15,11 +19,6 @@ from ..utils.tree_sitter_types import (
     Parser,
     Tree,
     TreeCursor,
-    ensure_cursor,
-    ensure_language,
-    ensure_node,
-    ensure_parser,
-    ensure_tree,
 )
 
 T = TypeVar("T")
@@ -54,9 +53,32 @@ def query_captures(query: Any, node: Any) -> Any:
     return query.captures(node)
 
 
+def _assign_parser_language(parser: Any, language: Any) -> None:
+    """Configure a parser through the language property (py-tree-sitter >= 0.22)."""
+    parser.language = language
+
+
+# Older bindings configure parsers with set_language(), newer ones through the
+# language property. Pick the one the installed binding supports once, at
+# import time, instead of trying set_language() on every parser.
+set_parser_language: Callable[[Any, Any], None] = (
+    cast(Callable[[Any, Any], None], Parser.set_language)
+    if hasattr(Parser, "set_language")
+    else _assign_parser_language
+)
+
+
+# Per-thread parsers keyed by id(language). Parsers are reusable once their
+# language is set, but a Parser must not be used by two threads at once.
+_thread_parsers = threading.local()
+
+
 def create_parser(language_obj: Any) -> Parser:
     """
-    Create a parser configured for a specific language.
+    Get a parser configured for a specific language.
+
+    Parsers are cached per thread and per Language object, so repeated calls
+    from the same thread return the same parser.
 
     Args:
         language_obj: Language object
@@ -64,21 +86,23 @@ def create_parser(language_obj: Any) -> Parser:
     Returns:
         Configured Parser
     """
-    parser = Parser()
-    safe_language = ensure_language(language_obj)
+    # Annotations stand in for the ensure_* casts, which cost a call at runtime
+    safe_language: Language = language_obj
 
-    # Try both set_language and language methods
-    try:
-        parser.set_language(safe_language)  # type: ignore
-    except AttributeError:
-        if hasattr(parser, "language"):
-            # Use the language method if available
-            parser.language = safe_language  # type: ignore
-        else:
-            # Fallback to setting the attribute directly
-            parser.language = safe_language  # type: ignore
+    parsers: Optional[Dict[int, Tuple[Any, Parser]]] = getattr(_thread_parsers, "parsers", None)
+    if parsers is None:
+        parsers = _thread_parsers.parsers = {}
 
-    return ensure_parser(parser)
+    # The entry holds the language itself so its id can't be reused while cached
+    cached = parsers.get(id(safe_language))
+    if cached is not None and cached[0] is safe_language:
+        return cached[1]
+
+    parser = Parser()
+    set_parser_language(parser, safe_language)
+
+    parsers[id(safe_language)] = (safe_language, parser)
+    return parser
 
 
 def parse_source(source: bytes, parser: Union[Parser, Any]) -> Tree:
@@ -92,9 +116,8 @@ def parse_source(source: bytes, parser: Union[Parser, Any]) -> Tree:
     Returns:
         Parsed Tree
     """
-    safe_parser = ensure_parser(parser)
-    tree = safe_parser.parse(source)
-    return ensure_tree(tree)
+    tree: Tree = parser.parse(source)
+    return tree
 
 
 def parse_source_incremental(source: bytes, old_tree: Optional[Tree], parser: Parser) -> Tree:
@@ -109,9 +132,8 @@ def parse_source_incremental(source: bytes, old_tree: Optional[Tree], parser: Pa
     Returns:
         Parsed Tree
     """
-    safe_parser = ensure_parser(parser)
-    tree = safe_parser.parse(source, old_tree)
-    return ensure_tree(tree)
+    tree: Tree = parser.parse(source, old_tree)
+    return tree
 
 
 def edit_tree(
@@ -138,12 +160,10 @@ def edit_tree(
     Returns:
         Edited tree
     """
-    safe_tree = ensure_tree(tree)
-
     # Handle both dictionary and individual parameters
     if isinstance(edit_dict_or_start_byte, dict):
         edit_dict = edit_dict_or_start_byte
-        safe_tree.edit(
+        tree.edit(
             start_byte=edit_dict["start_byte"],
             old_end_byte=edit_dict["old_end_byte"],
             new_end_byte=edit_dict["new_end_byte"],
@@ -160,7 +180,7 @@ def edit_tree(
         _old_end_point = (0, 0) if old_end_point is None else old_end_point
         _new_end_point = (0, 0) if new_end_point is None else new_end_point
 
-        safe_tree.edit(
+        tree.edit(
             start_byte=edit_dict_or_start_byte,
             old_end_byte=_old_end_byte,
             new_end_byte=_new_end_byte,
@@ -168,13 +188,16 @@ def edit_tree(
             old_end_point=_old_end_point,
             new_end_point=_new_end_point,
         )
-    return safe_tree
+    return tree
 
 
 def get_changed_ranges(old_tree: Tree, new_tree: Tree) -> List[Tuple[int, int]]:
     """
     Get changed ranges between two syntax trees.
 
+    For precise ranges, the edit must have been applied to old_tree (see
+    edit_tree) before new_tree was parsed from it incrementally.
+
     Args:
         old_tree: Old syntax tree
         new_tree: New syntax tree
@@ -182,17 +205,14 @@ def get_changed_ranges(old_tree: Tree, new_tree: Tree) -> List[Tuple[int, int]]:
     Returns:
         List of changed ranges as tuples of (start_byte, end_byte)
     """
-    safe_old_tree = ensure_tree(old_tree)
-    safe_new_tree = ensure_tree(new_tree)
-
-    # Note: This is a simplified implementation as tree_sitter Python
-    # binding might not expose changed_ranges directly
-    # In a real implementation, you would call:
-    # ranges = old_tree.changed_ranges(new_tree)
+    if hasattr(old_tree, "changed_ranges"):
+        # Let tree-sitter compare the trees; it only descends into subtrees
+        # that are not shared between them
+        return [(r.start_byte, r.end_byte) for r in old_tree.changed_ranges(new_tree)]
 
-    # For now, return a basic comparison at the root level
-    old_root = safe_old_tree.root_node
-    new_root = safe_new_tree.root_node
+    # Bindings without changed_ranges: compare at the root level
+    old_root = old_tree.root_node
+    new_root = new_tree.root_node
 
     if old_root.start_byte != new_root.start_byte or old_root.end_byte != new_root.end_byte:
         # Return the entire tree as changed
@@ -236,29 +256,48 @@ def parse_file(
     raise ValueError(f"Invalid parser or language: {parser_or_language}")
 
 
-def get_node_text(node: Node, source_bytes: bytes, decode: bool = True) -> Union[str, bytes]:
+def get_node_text(node: Node, source_bytes: Union[bytes, memoryview], decode: bool = True) -> Union[str, bytes]:
     """
     Safely get text for a node from source bytes.
 
     Args:
         node: Node object
-        source_bytes: Source code as bytes
+        source_bytes: Source code as bytes, or a memoryview over them
         decode: Whether to decode bytes to string (default: True)
 
     Returns:
         Text for the node as string or bytes
     """
-    safe_node = ensure_node(node)
-    try:
-        node_bytes = source_bytes[safe_node.start_byte : safe_node.end_byte]
-        if decode:
-            try:
-                return node_bytes.decode("utf-8", errors="replace")
-            except (UnicodeDecodeError, AttributeError):
-                return str(node_bytes)
-        return node_bytes
-    except (IndexError, ValueError):
-        return "" if decode else b""
+    # Slicing clamps out-of-range offsets rather than raising
+    node_bytes = source_bytes[node.start_byte : node.end_byte]
+    if isinstance(node_bytes, memoryview):
+        # Decode the view directly rather than copying it to bytes first
+        return str(node_bytes, "utf-8", "replace") if decode else node_bytes.tobytes()
+    if decode:
+        try:
+            # The UTF-8 decoder already copies ASCII runs directly, so an
+            # isascii() pre-check would only add a second pass
+            return node_bytes.decode("utf-8", "replace")
+        except AttributeError:
+            return str(node_bytes)
+    return node_bytes
+
+
+def get_node_text_view(node: Node, source_view: memoryview) -> memoryview:
+    """
+    Get a zero-copy view of a node's bytes.
+
+    Useful for bulk passes that only need lengths or raw bytes; decode the
+    view (e.g. ``bytes(view).decode()``) only when a string is needed.
+
+    Args:
+        node: Node object
+        source_view: memoryview over the source bytes the node was parsed from
+
+    Returns:
+        memoryview slice covering the node
+    """
+    return source_view[node.start_byte : node.end_byte]
 
 
 def walk_tree(node: Node) -> TreeCursor:
@@ -271,12 +310,32 @@ def walk_tree(node: Node) -> TreeCursor:
     Returns:
         Tree cursor
     """
-    safe_node = ensure_node(node)
-    cursor = safe_node.walk()
-    return ensure_cursor(cursor)
+    return node.walk()
+
+
+def _current_field_name(cursor: Any) -> Optional[str]:
+    """Read the field name from a cursor through the older method API."""
+    return cast(Optional[str], cursor.current_field_name())
+
 
+def _field_name_property(cursor: Any) -> Optional[str]:
+    """Read the field name from a cursor through the field_name property."""
+    return cast(Optional[str], cursor.field_name)
 
-def cursor_walk_tree(node: Node, visit_fn: Callable[[Optional[Node], Optional[str], int], bool]) -> None:
+
+# Older bindings expose the current field through current_field_name(), newer
+# ones through the field_name property; choose once rather than per node
+cursor_field_name: Callable[[Any], Optional[str]] = (
+    _current_field_name if hasattr(TreeCursor, "current_field_name") else _field_name_property
+)
+
+
+def cursor_walk_tree(
+    node: Node,
+    visit_fn: Callable[[Optional[Node], Optional[str], int], bool],
+    *,
+    want_field_name: bool = False,
+) -> None:
     """
     Walk a tree using cursor for efficiency.
 
@@ -284,54 +343,38 @@ def cursor_walk_tree(node: Node, visit_fn: Callable[[Optional[Node], Optional[st
         node: Root node to start from
         visit_fn: Function called for each node, receives (node, field_name, depth)
                   Return True to continue traversal, False to skip children
+        want_field_name: Whether to pass each node's field name in its parent;
+                         when False, field_name is always None
     """
-    cursor = walk_tree(node)
+    cursor = node.walk()
     field_name = None
     depth = 0
+    descend = visit_fn(cursor.node, field_name, depth)
 
-    if not visit_fn(cursor.node, field_name, depth):
-        return
-
-    if cursor.goto_first_child():
-        depth += 1
-
-        while True:
-            # Get field name if available
-            field_name = None
-            if cursor.node and cursor.node.parent:
-                parent_field_names = getattr(cursor.node.parent, "children_by_field_name", {})
-                if hasattr(parent_field_names, "items"):
-                    for name, nodes in parent_field_names.items():
-                        if cursor.node in nodes:
-                            field_name = name
-                            break
-
-            if visit_fn(cursor.node, field_name, depth):
-                # Visit children
-                if cursor.goto_first_child():
-                    depth += 1
-                    continue
-
-            # No children or children skipped, try siblings
-            if cursor.goto_next_sibling():
-                continue
-
-            # No more siblings, go up
-            while depth > 0:
+    while True:
+        if descend and cursor.goto_first_child():
+            depth += 1
+        else:
+            # No children to visit: move to the next sibling, climbing up as
+            # needed, and stop once we are back at the starting node
+            while depth > 0 and not cursor.goto_next_sibling():
                 cursor.goto_parent()
                 depth -= 1
+            if depth == 0:
+                return
 
-                if cursor.goto_next_sibling():
-                    break
+        # The cursor knows the field of the current node directly
+        if want_field_name:
+            field_name = cursor_field_name(cursor)
 
-            # If we've returned to the root, we're done
-            if depth == 0:
-                break
+        descend = visit_fn(cursor.node, field_name, depth)
 
 
 def collect_with_cursor(
     node: Node,
     collector_fn: Callable[[Optional[Node], Optional[str], int], Optional[T]],
+    *,
+    want_field_name: bool = False,
 ) -> List[T]:
     """
     Collect items from a tree using cursor traversal.
@@ -340,35 +383,102 @@ def collect_with_cursor(
         node: Root node to start from
         collector_fn: Function that returns an item to collect or None to skip
                      Receives (node, field_name, depth)
+        want_field_name: Whether collector_fn needs the field name of each node
 
     Returns:
         List of collected items
     """
     items: List[T] = []
 
-    def visit(node: Optional[Node], field_name: Optional[str], depth: int) -> bool:
-        if node is None:
-            return False
-        item = collector_fn(node, field_name, depth)
+    # The same walk as cursor_walk_tree, inlined so each node costs one call
+    # to collector_fn instead of going through a visit callback as well. Every
+    # subtree is visited, so there is no descend flag to check.
+    cursor = node.walk()
+    field_name = None
+    depth = 0
+    item = collector_fn(cursor.node, field_name, depth)
+    if item is not None:
+        items.append(item)
+
+    while True:
+        if cursor.goto_first_child():
+            depth += 1
+        else:
+            while depth > 0 and not cursor.goto_next_sibling():
+                cursor.goto_parent()
+                depth -= 1
+            if depth == 0:
+                return items
+
+        if want_field_name:
+            field_name = cursor_field_name(cursor)
+
+        item = collector_fn(cursor.node, field_name, depth)
         if item is not None:
             items.append(item)
-        return True  # Continue traversal
 
-    cursor_walk_tree(node, visit)
-    return items
+
+@functools.lru_cache(maxsize=256)
+def _node_type_query(language: Any, node_type: str) -> Any:
+    """Compile a query capturing every named node of a type, or None if unsupported."""
+    # A query pattern like (type) only matches named nodes, so leave types
+    # that also exist as anonymous nodes (or not at all) to the tree walk
+    symbol_id = language.id_for_node_kind(node_type, True)
+    if symbol_id is None or language.id_for_node_kind(node_type, False) is not None:
+        return None
+    # A supertype pattern like (expression) matches all of its subtypes
+    if language.node_kind_is_supertype(symbol_id):
+        return None
+    try:
+        return create_query(language, f"({node_type}) @node")
+    except Exception:
+        return None
+
+
+@functools.lru_cache(maxsize=256)
+def _node_type_ids(language: Any, node_type: str) -> FrozenSet[int]:
+    """Get every symbol id a language reports under a node type name."""
+    # A name can belong to several symbols (named and anonymous, or aliases),
+    # so collect them all rather than asking id_for_node_kind for one
+    return frozenset(i for i in range(language.node_kind_count) if language.node_kind_for_id(i) == node_type)
 
 
-def find_nodes_by_type(root_node: Node, node_type: str) -> List[Node]:
+def find_nodes_by_type(root_node: Node, node_type: str, language: Optional[Any] = None) -> List[Node]:
     """
     Find all nodes of a specific type in a tree.
 
     Args:
         root_node: Root node to search from
         node_type: Type of node to find
+        language: Optional Language of the tree; when given, matching is done
+                  by a tree-sitter query instead of walking every node in Python
 
     Returns:
         List of matching nodes
     """
+    if language is not None:
+        query = _node_type_query(language, node_type)
+        if query is not None:
+            captures = query_captures(query, root_node)
+            if isinstance(captures, dict):
+                nodes = list(captures.get("node", []))
+            else:
+                nodes = [capture[0] for capture in captures]
+            # Captures are not guaranteed to come back in document order; sort
+            # into the pre-order a tree walk would produce (outer nodes first)
+            nodes.sort(key=lambda n: (n.start_byte, -n.end_byte))
+            return nodes
+
+        # Otherwise compare integer symbol ids, which avoids building a type
+        # string for every node visited
+        type_ids = _node_type_ids(language, node_type)
+
+        def id_collector(node: Optional[Node], _field_name: Optional[str], _depth: int) -> Optional[Node]:
+            if node is not None and node.kind_id in type_ids:
+                return node
+            return None
+
+        return collect_with_cursor(root_node, id_collector)
 
     def collector(node: Optional[Node], _field_name: Optional[str], _depth: int) -> Optional[Node]:
         if node is None:
@@ -377,7 +487,7 @@ def find_nodes_by_type(root_node: Node, node_type: str) -> List[Node]:
             return node
         return None
 
-    return collect_with_cursor(root_node, collector)
+    return collect_with_cursor(root_node, collector, want_field_name=False)
 
 
 def get_node_descendants(node: Optional[Node], max_depth: Optional[int] = None) -> List[Node]:
@@ -396,18 +506,28 @@ def get_node_descendants(node: Optional[Node], max_depth: Optional[int] = None)
     if node is None:
         return descendants
 
-    def visit(node: Optional[Node], _field_name: Optional[str], depth: int) -> bool:
-        if node is None:
-            return False
-        if max_depth is not None and depth > max_depth:
-            return False  # Skip children
-
-        if depth > 0:  # Skip the root node
-            descendants.append(node)
+    # Walk with the cursor in this frame rather than through a visit callback,
+    # and fold "no limit" into the depth bound so each step is one comparison
+    limit = sys.maxsize if max_depth is None else max_depth
+    # cursor.node is never None while the cursor is inside the tree. A bound
+    # append beats filling a list presized from descendant_count, which needs
+    # an index store and increment per node plus a final trim.
+    append = cast(Callable[[Optional[Node]], None], descendants.append)
+    cursor = node.walk()
+    depth = 0
 
-        return True  # Continue traversal
+    while True:
+        if depth < limit and cursor.goto_first_child():
+            depth += 1
+        else:
+            # No children to visit: move to the next sibling, climbing up as needed
+            while depth > 0 and not cursor.goto_next_sibling():
+                cursor.goto_parent()
+                depth -= 1
+            if depth == 0:
+                break
+        append(cursor.node)
 
-    cursor_walk_tree(node, visit)
     return descendants
 
 
@@ -432,20 +552,27 @@ def parse_with_cached_tree(
 
         tree_cache = get_container().tree_cache
 
+    # Convert the path once and key the cache with the string
+    path_str = os.fspath(file_path)
+
     # Check if we have a cached tree
-    cached = tree_cache.get(file_path, language)
+    cached: Optional[Tuple[Tree, bytes]] = tree_cache.get(path_str, language)
     if cached:
-        tree, source_bytes = cached
-        # Ensure tree is properly typed
-        return ensure_tree(tree), source_bytes
+        return cached
+
+    source_bytes = read_binary_file(path_str)
+
+    # A file touched without changing its content keeps its cached tree
+    cached = tree_cache.revalidate(path_str, language, source_bytes)
+    if cached:
+        return cached
 
     # Parse the file using our own parser to avoid registry complications
     parser = create_parser(language_obj)
-    source_bytes = read_binary_file(file_path)
     tree = parse_source(source_bytes, parser)
 
     # Cache the tree
-    tree_cache.put(file_path, language, tree, source_bytes)
+    tree_cache.put(path_str, language, tree, source_bytes)
 
     return cast(Tuple[Tree, bytes], (tree, source_bytes))
 
@@ -461,6 +588,7 @@ def update_cached_tree(
     old_end_point: Tuple[int, int],
     new_end_point: Tuple[int, int],
     tree_cache: Any = None,
+    new_source: Optional[bytes] = None,
 ) -> Optional[Tuple[Tree, bytes]]:
     """
     Update a cached tree with edit operation.
@@ -472,6 +600,8 @@ def update_cached_tree(
         start_byte, old_end_byte, new_end_byte: Byte positions of edit
         start_point, old_end_point, new_end_point: Row/column positions of edit
         tree_cache: Tree cache instance (optional, falls back to container if not provided)
+        new_source: Source after the edit, if the caller already has it
+                    (read from file_path otherwise)
 
     Returns:
         Updated (tree, source_bytes) if successful, None otherwise
@@ -482,8 +612,11 @@ def update_cached_tree(
 
         tree_cache = get_container().tree_cache
 
+    # Convert the path once and key the cache with the string
+    path_str = os.fspath(file_path)
+
     # Check if we have a cached tree
-    cached = tree_cache.get(file_path, language)
+    cached = tree_cache.get(path_str, language)
     if not cached:
         return None
 
@@ -501,21 +634,31 @@ def update_cached_tree(
         }
         edit_tree(old_tree, edit_dict)
 
-        # Read updated source
-        with open(file_path, "rb") as f:
-            new_source = f.read()
+        # Read updated source unless the caller passed it in
+        if new_source is None:
+            new_source = read_binary_file(path_str)
 
         # Parse incrementally
         parser = create_parser(language_obj)
         new_tree = parse_source_incremental(new_source, old_tree, parser)
 
-        # Update cache
-        tree_cache.put(file_path, language, new_tree, new_source)
+        # Update cache, marking the file as being edited
+        tree_cache.put_hot(path_str, language, new_tree, new_source)
 
         return cast(Tuple[Tree, bytes], (new_tree, new_source))
     except Exception:
-        # If incremental parsing fails, fall back to full parse
-        return parse_with_cached_tree(file_path, language, language_obj, tree_cache=tree_cache)
+        # If incremental parsing fails, fall back to a full parse. This is done
+        # here rather than through parse_with_cached_tree, whose cache lookup
+        # could hand back the old tree that was just edited.
+        try:
+            if new_source is None:
+                new_source = read_binary_file(path_str)
+            new_tree = parse_source(new_source, create_parser(language_obj))
+        except OSError:
+            # The file can't be read (e.g. it was deleted), so there is no update
+            return None
+        tree_cache.put(path_str, language, new_tree, new_source)
+        return cast(Tuple[Tree, bytes], (new_tree, new_source))
 
 
 # Additional helper functions required by tests
@@ -553,6 +696,27 @@ def create_edit(
     }
 
 
+# File extension -> language used by parse_file_with_detection
+_EXT_LANG: Dict[str, str] = {
+    ".py": "python",
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".ts": "typescript",
+    ".tsx": "typescript",
+    ".java": "java",
+    ".c": "c",
+    ".h": "c",
+    ".cpp": "cpp",
+    ".hpp": "cpp",
+    ".cc": "cpp",
+    ".hh": "cpp",
+    ".go": "go",
+    ".rs": "rust",
+    ".rb": "ruby",
+    ".php": "php",
+}
+
+
 def parse_file_with_detection(file_path: Path, language: Optional[str], registry: Any) -> Tuple[Tree, bytes]:
     """
     Parse a file with language detection.
@@ -570,28 +734,9 @@ def parse_file_with_detection(file_path: Path, language: Optional[str], registry
 
     # Auto-detect language if not provided
     if language is None:
-        ext = file_path.suffix.lower()
-        if ext == ".py":
-            language = "python"
-        elif ext in [".js", ".jsx"]:
-            language = "javascript"
-        elif ext in [".ts", ".tsx"]:
-            language = "typescript"
-        elif ext in [".java"]:
-            language = "java"
-        elif ext in [".c", ".h"]:
-            language = "c"
-        elif ext in [".cpp", ".hpp", ".cc", ".hh"]:
-            language = "cpp"
-        elif ext in [".go"]:
-            language = "go"
-        elif ext in [".rs"]:
-            language = "rust"
-        elif ext in [".rb"]:
-            language = "ruby"
-        elif ext in [".php"]:
-            language = "php"
-        else:
+        # splitext works on the path string without Path.suffix's splitting
+        language = _EXT_LANG.get(os.path.splitext(os.fspath(file_path))[1].lower())
+        if language is None:
             raise ValueError(f"Could not detect language for file: {file_path}")
 
     if language is None:
@@ -648,16 +793,23 @@ def get_node_with_text(node: Node, source_bytes: bytes, text: bytes) -> Optional
     Returns:
         Node containing the text or None if not found
     """
-    # Ensure we get bytes back from get_node_text
-    if text in get_node_text(node, source_bytes, decode=False):
-        # Check if any child contains the text
-        for child in node.children:
-            result = get_node_with_text(child, source_bytes, text)
-            if result is not None:
-                return result
-        # If no child contains the text, return this node
-        return node
-    return None
+    # Search the source within each node's byte range instead of slicing
+    # out its text, and walk one cursor down instead of recursing
+    if source_bytes.find(text, node.start_byte, node.end_byte) == -1:
+        return None
+
+    find = source_bytes.find
+    cursor = node.walk()
+    while cursor.goto_first_child():
+        # Descend into the first child that contains the text
+        child = cast(Node, cursor.node)
+        while find(text, child.start_byte, child.end_byte) == -1:
+            if not cursor.goto_next_sibling():
+                # No child contains the text, so this node is the tightest match
+                cursor.goto_parent()
+                return cursor.node
+            child = cast(Node, cursor.node)
+    return cursor.node
 
 
 def is_node_inside(pos_or_node: Union[Node, Tuple[int, int]], container_node: Node) -> bool:
@@ -677,22 +829,15 @@ def is_node_inside(pos_or_node: Union[Node, Tuple[int, int]], container_node: No
         start_row, start_col = container_node.start_point
         end_row, end_col = container_node.end_point
 
-        # Check if position is within node boundaries
-        if row < start_row or row > end_row:
-            return False
-        if row == start_row and column < start_col:
-            return False
-        if row == end_row and column > end_col:
-            return False
-        return True
+        # Pack (row, column) into one integer so that ordering positions is a
+        # single comparison; tree-sitter columns fit in 32 bits
+        position = (row << 32) + column
+        return (start_row << 32) + start_col <= position <= (end_row << 32) + end_col
 
-    # Handle node case
+    # Handle node case. Byte offsets order the same way as points, and a node
+    # is inside itself.
     node = pos_or_node
-    if node == container_node:
-        return True  # Node is inside itself
-
-    # Check if node's boundaries are within container's boundaries
-    return is_node_inside(node.start_point, container_node) and is_node_inside(node.end_point, container_node)
+    return container_node.start_byte <= node.start_byte and node.end_byte <= container_node.end_byte
 
 
 def find_all_descendants(node: Node, max_depth: Optional[int] = None) -> List[Node]:
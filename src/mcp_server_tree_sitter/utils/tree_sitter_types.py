@@ -5,71 +5,69 @@ the tree-sitter library to ensure type safety with or without
 the library installed.
 """
 
-from typing import Any, Protocol, TypeVar, cast
+from typing import TYPE_CHECKING, Any, Protocol, TypeVar, cast
 
+# Protocols describing the tree-sitter interfaces are only needed by type
+# checkers, so they are not built at runtime
+if TYPE_CHECKING:
 
-# Define protocols for tree-sitter types
-class LanguageProtocol(Protocol):
-    """Protocol for Tree-sitter Language class."""
+    class LanguageProtocol(Protocol):
+        """Protocol for Tree-sitter Language class."""
 
-    def query(self, query_string: str) -> Any: ...
+        def query(self, query_string: str) -> Any: ...
 
+    class ParserProtocol(Protocol):
+        """Protocol for Tree-sitter Parser class."""
 
-class ParserProtocol(Protocol):
-    """Protocol for Tree-sitter Parser class."""
+        def set_language(self, language: Any) -> None: ...
+        def language(self, language: Any) -> None: ...  # Alternative name for set_language
+        def parse(self, bytes_input: bytes) -> Any: ...
 
-    def set_language(self, language: Any) -> None: ...
-    def language(self, language: Any) -> None: ...  # Alternative name for set_language
-    def parse(self, bytes_input: bytes) -> Any: ...
+    class TreeProtocol(Protocol):
+        """Protocol for Tree-sitter Tree class."""
 
+        @property
+        def root_node(self) -> Any: ...
 
-class TreeProtocol(Protocol):
-    """Protocol for Tree-sitter Tree class."""
-
-    @property
-    def root_node(self) -> Any: ...
-
-
-class NodeProtocol(Protocol):
-    """Protocol for Tree-sitter Node class."""
-
-    @property
-    def children(self) -> list[Any]: ...
-    @property
-    def named_children(self) -> list[Any]: ...
-    @property
-    def child_count(self) -> int: ...
-    @property
-    def named_child_count(self) -> int: ...
-    @property
-    def start_point(self) -> tuple[int, int]: ...
-    @property
-    def end_point(self) -> tuple[int, int]: ...
-    @property
-    def start_byte(self) -> int: ...
-    @property
-    def end_byte(self) -> int: ...
-    @property
-    def type(self) -> str: ...
-    @property
-    def is_named(self) -> bool: ...
-    @property
-    def parent(self) -> Any: ...
-    @property
-    def children_by_field_name(self) -> dict[str, list[Any]]: ...
+    class NodeProtocol(Protocol):
+        """Protocol for Tree-sitter Node class."""
 
-    def walk(self) -> Any: ...
+        @property
+        def children(self) -> list[Any]: ...
+        @property
+        def named_children(self) -> list[Any]: ...
+        @property
+        def child_count(self) -> int: ...
+        @property
+        def named_child_count(self) -> int: ...
+        @property
+        def start_point(self) -> tuple[int, int]: ...
+        @property
+        def end_point(self) -> tuple[int, int]: ...
+        @property
+        def start_byte(self) -> int: ...
+        @property
+        def end_byte(self) -> int: ...
+        @property
+        def type(self) -> str: ...
+        @property
+        def is_named(self) -> bool: ...
+        @property
+        def parent(self) -> Any: ...
+        @property
+        def children_by_field_name(self) -> dict[str, list[Any]]: ...
 
+        def walk(self) -> Any: ...
 
-class CursorProtocol(Protocol):
-    """Protocol for Tree-sitter Cursor class."""
+    class CursorProtocol(Protocol):
+        """Protocol for Tree-sitter Cursor class."""
 
-    @property
-    def node(self) -> Any: ...
+        @property
+        def node(self) -> Any: ...
 
-    def goto_first_child(self) -> bool: ...
-    def goto_next_sibling(self) -> bool: ...
-    def goto_parent(self) -> bool: ...
+        def goto_first_child(self) -> bool: ...
+        def goto_next_sibling(self) -> bool: ...
+        def goto_parent(self) -> bool: ...
 
 
 # Type variables for type safety
@@ -91,118 +89,15 @@ try:
     TreeCursor = _TreeCursor
     HAS_TREE_SITTER = True
 except ImportError:
-    # Create stub classes if tree-sitter is not available
+    # tree-sitter is a required dependency; if it is missing, export
+    # placeholders so this module still imports and callers fail on use
     HAS_TREE_SITTER = False
 
-    class DummyLanguage:
-        """Dummy implementation when tree-sitter is not available."""
-
-        def __init__(self, *args: Any, **kwargs: Any) -> None:
-            pass
-
-        def query(self, query_string: str) -> Any:
-            """Dummy query method."""
-            return None
-
-    class DummyParser:
-        """Dummy implementation when tree-sitter is not available."""
-
-        def set_language(self, language: Any) -> None:
-            """Dummy set_language method."""
-            pass
-
-        def language(self, language: Any) -> None:
-            """Dummy language method (alternative to set_language)."""
-            pass
-
-        def parse(self, bytes_input: bytes) -> Any:
-            """Dummy parse method."""
-            return None
-
-    class DummyNode:
-        """Dummy implementation when tree-sitter is not available."""
-
-        @property
-        def children(self) -> list[Any]:
-            return []
-
-        @property
-        def named_children(self) -> list[Any]:
-            return []
-
-        @property
-        def child_count(self) -> int:
-            return 0
-
-        @property
-        def named_child_count(self) -> int:
-            return 0
-
-        @property
-        def start_point(self) -> tuple[int, int]:
-            return (0, 0)
-
-        @property
-        def end_point(self) -> tuple[int, int]:
-            return (0, 0)
-
-        @property
-        def start_byte(self) -> int:
-            return 0
-
-        @property
-        def end_byte(self) -> int:
-            return 0
-
-        @property
-        def type(self) -> str:
-            return ""
-
-        @property
-        def is_named(self) -> bool:
-            return False
-
-        @property
-        def parent(self) -> Any:
-            return None
-
-        @property
-        def children_by_field_name(self) -> dict[str, list[Any]]:
-            return {}
-
-        def walk(self) -> Any:
-            return DummyTreeCursor()
-
-    class DummyTreeCursor:
-        """Dummy implementation when tree-sitter is not available."""
-
-        @property
-        def node(self) -> Any:
-            return DummyNode()
-
-        def goto_first_child(self) -> bool:
-            return False
-
-        def goto_next_sibling(self) -> bool:
-            return False
-
-        def goto_parent(self) -> bool:
-            return False
-
-    class DummyTree:
-        """Dummy implementation when tree-sitter is not available."""
-
-        @property
-        def root_node(self) -> Any:
-            return DummyNode()
-
-    # Export dummy types for type checking
-    # Declare dummy types for when tree-sitter is not available
-    Language = DummyLanguage  # type: ignore
-    Parser = DummyParser  # type: ignore
-    Tree = DummyTree  # type: ignore
-    Node = DummyNode  # type: ignore
-    TreeCursor = DummyTreeCursor  # type: ignore
+    Language = object  # type: ignore
+    Parser = object  # type: ignore
+    Tree = object  # type: ignore
+    Node = object  # type: ignore
+    TreeCursor = object  # type: ignore
 
 
 # Helper function to safely cast to tree-sitter types
@@ -1,5 +1,8 @@
 """Pytest configuration for mcp-server-tree-sitter tests."""
 
+from pathlib import Path
+from typing import Any, Dict, Generator
+
 import pytest
 
 # Import and register the diagnostic plugin
@@ -31,3 +34,60 @@ def reset_project_registry():
     # Restore original projects
     registry._projects.clear()
     registry._projects.update(original_projects)
+
+
+@pytest.fixture(scope="session")
+def language_registry():
+    """Provide one LanguageRegistry for the whole test session.
+
+    The registry only caches languages and parsers, so sharing it lets tests
+    reuse parsers loaded by earlier tests.
+    """
+    from mcp_server_tree_sitter.language.registry import LanguageRegistry
+
+    return LanguageRegistry()
+
+
+@pytest.fixture(scope="session")
+def python_language(language_registry):
+    """Provide the Python grammar, loaded once for the whole test session."""
+    return language_registry.get_language("python")
+
+
+@pytest.fixture(scope="module")
+def project_dir(request, tmp_path_factory) -> Path:
+    """Write the requesting module's PROJECT_FILES once for all of its tests.
+
+    PROJECT_FILES maps file names to their contents, as str or bytes.
+    """
+    module = request.module
+    project_path: Path = tmp_path_factory.mktemp(module.__name__.rpartition(".")[2])
+    for name, content in module.PROJECT_FILES.items():
+        if isinstance(content, bytes):
+            (project_path / name).write_bytes(content)
+        else:
+            (project_path / name).write_text(content)
+    return project_path
+
+
+@pytest.fixture
+def test_project(project_dir: Path) -> Generator[Dict[str, Any], None, None]:
+    """Register the module's shared project_dir as a project for one test.
+
+    Registration stays per test because the project registry is reset
+    between tests; the directory name from tmp_path_factory keeps the
+    project name unique.
+    """
+    from mcp_server_tree_sitter.api import get_project_registry
+    from tests.test_helpers import register_project_tool
+
+    project_name = project_dir.name
+    register_project_tool(path=str(project_dir), name=project_name)
+
+    try:
+        yield {"name": project_name, "path": project_dir, "file": "test.py"}
+    finally:
+        try:
+            get_project_registry().remove_project(project_name)
+        except Exception:
+            pass
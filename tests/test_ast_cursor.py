@@ -9,7 +9,7 @@ from mcp_server_tree_sitter.utils.file_io import read_binary_file
 from mcp_server_tree_sitter.utils.tree_sitter_helpers import create_parser, parse_source
 
 
-def test_cursor_based_ast() -> None:
+def test_cursor_based_ast(language_registry: LanguageRegistry) -> None:
     """Test that the cursor-based AST node_to_dict function works."""
     # Create a temporary test file
     with tempfile.NamedTemporaryFile(suffix=".py", mode="w+") as f:
@@ -18,11 +18,10 @@ def test_cursor_based_ast() -> None:
 
         file_path = Path(f.name)
 
-        # Set up language registry
-        registry = LanguageRegistry()
-        language = registry.language_for_file(file_path.name)
+        # Look up the language through the shared registry
+        language = language_registry.language_for_file(file_path.name)
         assert language is not None, "Could not detect language for test file"
-        language_obj = registry.get_language(language)
+        language_obj = language_registry.get_language(language)
 
         # Parse the file
         parser = create_parser(language_obj)
@@ -61,5 +60,5 @@ def test_cursor_based_ast() -> None:
 
 
 if __name__ == "__main__":
-    test_cursor_based_ast()
+    test_cursor_based_ast(LanguageRegistry())
     print("All tests passed!")
@@ -1,6 +1,7 @@
 """Basic tests for mcp-server-tree-sitter."""
 
 import tempfile
+from pathlib import Path
 
 from mcp_server_tree_sitter.config import ServerConfig
 from mcp_server_tree_sitter.language.registry import LanguageRegistry
@@ -30,12 +31,9 @@ def test_project_registry() -> None:
 
         # Check project details
         assert project.name == "test"
-        # Use os.path.samefile to compare paths instead of string comparison
-        # This handles platform-specific path normalization
-        # (e.g., /tmp -> /private/tmp on macOS)
-        import os
-
-        assert os.path.samefile(str(project.root_path), temp_dir)
+        # Compare resolved paths rather than raw strings. This handles
+        # platform-specific path normalization (e.g., /tmp -> /private/tmp on macOS)
+        assert Path(project.root_path).resolve() == Path(temp_dir).resolve()
 
         # List projects
         projects = registry.list_projects()
@@ -52,9 +50,9 @@ def test_project_registry() -> None:
         assert len(projects) == 0
 
 
-def test_language_registry() -> None:
+def test_language_registry(language_registry: LanguageRegistry) -> None:
     """Test language registry functionality."""
-    registry = LanguageRegistry()
+    registry = language_registry
 
     # Test language detection
     assert registry.language_for_file("test.py") == "python"
@@ -75,5 +73,5 @@ if __name__ == "__main__":
     # Run tests
     test_config_default()
     test_project_registry()
-    test_language_registry()
+    test_language_registry(LanguageRegistry())
     print("All tests passed!")
@@ -1,45 +1,20 @@
 """Tests for cache-specific configuration settings."""
 
-import tempfile
 import time
 from pathlib import Path
 
 import pytest
 
 from mcp_server_tree_sitter.api import get_language_registry, get_project_registry, get_tree_cache
-from tests.test_helpers import get_ast, register_project_tool, temp_config
-
-
-@pytest.fixture
-def test_project():
-    """Create a temporary test project with sample files."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        project_path = Path(temp_dir)
-
-        # Create multiple files to test cache capacity
-        for i in range(10):
-            test_file = project_path / f"file{i}.py"
-            with open(test_file, "w") as f:
-                # Make each file unique and sizeable
-                f.write(f"# File {i}\n")
-                f.write(f"def function{i}():\n")
-                f.write(f"    print('This is function {i}')\n\n")
-                # Add more content to make files reasonably sized
-                for j in range(20):
-                    f.write(f"    # Comment line {j} to add size\n")
-
-        # Register the project
-        project_name = "cache_test_project"
-        try:
-            register_project_tool(path=str(project_path), name=project_name)
-        except Exception:
-            # If registration fails, try with a more unique name
-            import time
-
-            project_name = f"cache_test_project_{int(time.time())}"
-            register_project_tool(path=str(project_path), name=project_name)
+from tests.test_helpers import get_ast, temp_config
 
-        yield {"name": project_name, "path": str(project_path)}
+# Multiple files to test cache capacity. Comment lines add size; the header
+# makes each file unique.
+_PADDING = "".join(f"    # Comment line {j} to add size\n" for j in range(20))
+PROJECT_FILES = {
+    f"file{i}.py": f"# File {i}\ndef function{i}():\n    print('This is function {i}')\n\n" + _PADDING
+    for i in range(10)
+}
 
 
 def test_cache_max_size_setting(test_project):
@@ -48,15 +23,11 @@ def test_cache_max_size_setting(test_project):
     tree_cache = get_tree_cache()
     tree_cache.invalidate()
 
-    # Create larger files to force eviction
+    # Create larger files to force eviction: 300 lines of ~10 chars each = ~3KB
+    lines = "".join(f"# Line {j:04d}\n" for j in range(300))
     for i in range(5):
         large_file = Path(test_project["path"]) / f"large_file{i}.py"
-        with open(large_file, "w") as f:
-            # Create a file with approximately 3KB of data
-            f.write(f"# File {i} - larger content to trigger cache eviction\n")
-            # Add 300 lines with 10 chars each = ~3KB
-            for j in range(300):
-                f.write(f"# Line {j:04d}\n")
+        large_file.write_text(f"# File {i} - larger content to trigger cache eviction\n" + lines)
 
     # Set a very small cache size (just 8KB, so only 2-3 files can fit)
     with temp_config(**{"cache.max_size_mb": 0.008, "cache.enabled": True}):
@@ -88,8 +59,8 @@ def test_cache_ttl_setting(test_project):
     tree_cache = get_tree_cache()
     tree_cache.invalidate()
 
-    # Set a very short TTL (1 second)
-    with temp_config(**{"cache.ttl_seconds": 1, "cache.enabled": True}):
+    # Set a very short TTL (50 milliseconds)
+    with temp_config(**{"cache.ttl_seconds": 0.05, "cache.enabled": True}):
         # Parse a file
         file_path = "file0.py"
         get_ast(project=test_project["name"], path=file_path)
@@ -107,7 +78,7 @@ def test_cache_ttl_setting(test_project):
         assert cached_before is not None, "Entry should be in cache initially"
 
         # Wait for TTL to expire
-        time.sleep(1.5)
+        time.sleep(0.1)
 
         # Check if entry was removed after TTL expiration
         tree_cache = get_tree_cache()
@@ -121,15 +92,11 @@ def test_cache_eviction_policy(test_project):
     tree_cache = get_tree_cache()
     tree_cache.invalidate()
 
-    # Create larger files to force eviction
+    # Create larger files to force eviction: 300 lines of ~10 chars each = ~3KB
+    lines = "".join(f"# Evict {j:04d}\n" for j in range(300))
     for i in range(5):
         large_file = Path(test_project["path"]) / f"large_evict{i}.py"
-        with open(large_file, "w") as f:
-            # Create a file with approximately 3KB of data
-            f.write(f"# File {i} for eviction test\n")
-            # Add 300 lines with 10 chars each = ~3KB
-            for j in range(300):
-                f.write(f"# Evict {j:04d}\n")
+        large_file.write_text(f"# File {i} for eviction test\n" + lines)
 
     # Set a tiny cache size to force eviction (6KB = only 2 files)
     with temp_config(**{"cache.max_size_mb": 0.006, "cache.enabled": True}):
@@ -190,3 +157,111 @@ def test_cache_eviction_policy(test_project):
         finally:
             # Restore original method
             tree_cache.get = original_get
+
+
+def test_cache_accepts_str_and_path_keys(tmp_path):
+    """A tree cached under a str path is found through the equivalent Path and vice versa."""
+    from mcp_server_tree_sitter.cache.parser_cache import TreeCache
+
+    source_file = tmp_path / "keyed.py"
+    source_file.write_text("x = 1\n")
+    parser = get_language_registry().get_parser("python")
+    tree = parser.parse(b"x = 1\n")
+
+    cache = TreeCache()
+    cache.put(str(source_file), "python", tree, b"x = 1\n")
+    assert cache.get(source_file, "python") is not None
+    assert cache.get(str(source_file), "python")[1] == b"x = 1\n"
+
+    cache.invalidate(source_file)
+    assert cache.get(str(source_file), "python") is None
+
+
+def test_cache_evicts_hot_entries_last(tmp_path, monkeypatch):
+    """Entries cached with put_hot outlive older and newer ordinary entries."""
+    from mcp_server_tree_sitter.cache.parser_cache import TreeCache
+
+    parser = get_language_registry().get_parser("python")
+    source = b"x = 1\n" + b"#" * 2000 + b"\n"
+    tree = parser.parse(source)
+
+    cache = TreeCache()
+    paths = []
+    for name in ("edited.py", "scanned1.py", "scanned2.py"):
+        path = tmp_path / name
+        path.write_bytes(source)
+        paths.append(path)
+
+    cache.put_hot(paths[0], "python", tree, source)
+    cache.put(paths[1], "python", tree, source)
+    cache.put(paths[2], "python", tree, source)
+
+    # Shrink the cache so that making room evicts all but one entry
+    monkeypatch.setattr(cache, "_get_max_size_mb", lambda: 0.005)
+    cache._evict_entries(len(source) * 2)
+
+    assert cache.get(paths[0], "python") is not None
+    assert cache.get(paths[1], "python") is None
+    assert cache.get(paths[2], "python") is None
+    assert len(cache.hot_keys) == 1
+    assert list(cache.current_keys.values()) == list(cache.cache)
+
+
+def test_cache_put_clears_hot_mark(tmp_path):
+    """An ordinary put of a hot entry makes it evictable like any other entry."""
+    import os
+
+    from mcp_server_tree_sitter.cache.parser_cache import TreeCache
+
+    source = b"x = 1\n"
+    source_file = tmp_path / "once_edited.py"
+    source_file.write_bytes(source)
+    tree = get_language_registry().get_parser("python").parse(source)
+
+    cache = TreeCache()
+    cache.put_hot(source_file, "python", tree, source)
+    assert len(cache.hot_keys) == 1
+    cache.put(source_file, "python", tree, source)
+    assert not cache.hot_keys
+
+    # Revalidating a hot entry under a new mtime does not carry the mark over
+    cache.put_hot(source_file, "python", tree, source)
+    stat = os.stat(source_file)
+    os.utime(source_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert cache.revalidate(source_file, "python", source) is not None
+    assert not cache.hot_keys
+
+
+def test_cache_revalidates_touched_file(tmp_path):
+    """A file whose mtime changed but whose content did not keeps its cached tree."""
+    import os
+
+    from mcp_server_tree_sitter.cache.parser_cache import TreeCache
+
+    source = b"x = 1\n"
+    source_file = tmp_path / "touched.py"
+    source_file.write_bytes(source)
+    tree = get_language_registry().get_parser("python").parse(source)
+
+    cache = TreeCache()
+    cache.put(source_file, "python", tree, source)
+
+    # Move the mtime forward so the mtime-based key no longer matches
+    stat = os.stat(source_file)
+    os.utime(source_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert cache.get(source_file, "python") is None
+    assert cache.revalidate(source_file, "python", b"x = 2\n") is None
+
+    revalidated = cache.revalidate(source_file, "python", source)
+    assert revalidated is not None
+    assert revalidated[0] is tree
+    # The entry now lives under the current key, and only there
+    assert cache.get(source_file, "python")[0] is tree
+    assert len(cache.cache) == 1
+    assert list(cache.current_keys.values()) == list(cache.cache)
+
+    # Invalidated entries are dropped from the key index too
+    os.utime(source_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+    cache.invalidate(source_file)
+    assert not cache.current_keys
+    assert cache.revalidate(source_file, "python", source) is None
@@ -1,6 +1,5 @@
 """Tests for how configuration settings affect actual system behavior."""
 
-import tempfile
 from pathlib import Path
 
 import pytest
@@ -10,29 +9,39 @@ from mcp_server_tree_sitter.exceptions import FileAccessError
 from tests.test_helpers import get_ast, register_project_tool, temp_config
 
 
-@pytest.fixture
-def test_project():
-    """Create a temporary test project with sample files."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        project_path = Path(temp_dir)
+class _TrackedCall:
+    """Wrap a cache method, counting calls and how many returned a value."""
 
-        # Create a simple Python file
-        test_file = project_path / "test.py"
-        with open(test_file, "w") as f:
-            f.write("def hello():\n    print('Hello, world!')\n\nhello()\n")
+    __slots__ = ("inner", "calls", "hits")
 
-        # Register the project
-        project_name = "config_behavior_test"
-        try:
-            register_project_tool(path=str(project_path), name=project_name)
-        except Exception:
-            # If registration fails, try with a more unique name
-            import time
+    def __init__(self, inner):
+        self.inner = inner
+        self.calls = 0
+        self.hits = 0
 
-            project_name = f"config_behavior_test_{int(time.time())}"
-            register_project_tool(path=str(project_path), name=project_name)
+    @property
+    def misses(self):
+        return self.calls - self.hits
 
-        yield {"name": project_name, "path": str(project_path), "file": "test.py"}
+    def __call__(self, *args, **kwargs):
+        result = self.inner(*args, **kwargs)
+        self.calls += 1
+        if result is not None:
+            self.hits += 1
+        return result
+
+
+@pytest.fixture
+def test_project(tmp_path):
+    """Create a temporary test project with sample files."""
+    # Create a simple Python file
+    (tmp_path / "test.py").write_text("def hello():\n    print('Hello, world!')\n\nhello()\n")
+
+    # Register the project; tmp_path is unique per test, and so is its name
+    project_name = f"config_behavior_test_{tmp_path.name}"
+    register_project_tool(path=str(tmp_path), name=project_name)
+
+    return {"name": project_name, "path": str(tmp_path), "file": "test.py"}
 
 
 def test_cache_enabled_setting(test_project):
@@ -45,29 +54,11 @@ def test_cache_enabled_setting(test_project):
 
     # Test with cache enabled
     with temp_config(**{"cache.enabled": True}):
-        # First parse should not be from cache
-        # No need to get language registry here
-        # Language detection is not needed here
-
-        # Track cache access
-        cache_miss_count = 0
-        cache_hit_count = 0
-
-        # Get tree cache
         tree_cache = get_tree_cache()
 
-        # Override get method to track cache hits/misses
+        # Wrap get to count cache hits and misses
         original_get = tree_cache.get
-
-        def tracked_get(*args, **kwargs):
-            nonlocal cache_hit_count, cache_miss_count
-            result = original_get(*args, **kwargs)
-            if result is None:
-                cache_miss_count += 1
-            else:
-                cache_hit_count += 1
-            return result
-
+        tracked_get = _TrackedCall(original_get)
         tree_cache.get = tracked_get
 
         try:
@@ -77,8 +68,8 @@ def test_cache_enabled_setting(test_project):
             get_ast(project=test_project["name"], path=test_project["file"])
 
             # Verify we got a cache hit on the second parse
-            assert cache_miss_count == 1, "First parse should be a cache miss"
-            assert cache_hit_count == 1, "Second parse should be a cache hit"
+            assert tracked_get.misses == 1, "First parse should be a cache miss"
+            assert tracked_get.hits == 1, "Second parse should be a cache hit"
         finally:
             # Restore original method
             tree_cache.get = original_get
@@ -89,29 +80,13 @@ def test_cache_enabled_setting(test_project):
 
     # Test with cache disabled
     with temp_config(**{"cache.enabled": False}):
-        # Track cache access
-        cache_miss_count = 0
-        put_count = 0
-
-        # Get tree cache
         tree_cache = get_tree_cache()
 
-        # Override methods to track cache activity
+        # Wrap get and put to track cache activity
         original_get = tree_cache.get
         original_put = tree_cache.put
-
-        def tracked_get(*args, **kwargs):
-            nonlocal cache_miss_count
-            result = original_get(*args, **kwargs)
-            if result is None:
-                cache_miss_count += 1
-            return result
-
-        def tracked_put(*args, **kwargs):
-            nonlocal put_count
-            put_count += 1
-            return original_put(*args, **kwargs)
-
+        tracked_get = _TrackedCall(original_get)
+        tracked_put = _TrackedCall(original_put)
         tree_cache.get = tracked_get
         tree_cache.put = tracked_put
 
@@ -122,8 +97,8 @@ def test_cache_enabled_setting(test_project):
             _ = get_ast(project=test_project["name"], path=test_project["file"])
 
             # Verify both parses were cache misses and no cache puts occurred
-            assert cache_miss_count == 2, "Both parses should be cache misses"
-            assert put_count == 0, "No cache puts should occur with cache disabled"
+            assert tracked_get.misses == 2, "Both parses should be cache misses"
+            assert tracked_put.calls == 0, "No cache puts should occur with cache disabled"
         finally:
             # Restore original methods
             tree_cache.get = original_get
@@ -135,13 +110,9 @@ def test_security_file_size_limit(test_project):
     # Create a larger file
     large_file_path = Path(test_project["path"]) / "large.py"
 
-    # Generate a file just over 1MB
-    with open(large_file_path, "w") as f:
-        # Create a comment line with approx 1000 chars
-        comment_line = "# " + "X" * 998 + "\n"
-        # Write ~1100 lines for a ~1.1MB file
-        for _ in range(1100):
-            f.write(comment_line)
+    # Generate a file just over 1MB: ~1100 comment lines of ~1000 chars each
+    comment_line = b"# " + b"X" * 998 + b"\n"
+    large_file_path.write_bytes(comment_line * 1100)
 
     # Set a 1MB file size limit
     with temp_config(**{"security.max_file_size_mb": 1}):
@@ -209,27 +180,20 @@ class OuterClass:
     with temp_config(**{"language.default_max_depth": 2}):
         result = get_ast(project=test_project["name"], path="nested.py")
 
-        # Helper function to find the maximum depth in the AST
-        def find_max_depth(node, current_depth=0):
-            if not isinstance(node, dict):
-                return current_depth
-
-            if "children" not in node:
-                return current_depth
-
-            # Check if we hit a depth limit (truncated)
-            if "truncated" in node:
-                return current_depth
-
-            if not node["children"]:
-                return current_depth
-
-            max_child_depth = 0
-            for child in node["children"]:
-                child_depth = find_max_depth(child, current_depth + 1)
-                max_child_depth = max(max_child_depth, child_depth)
-
-            return max_child_depth
+        # Helper function to find the maximum depth in the AST, walking it
+        # with an explicit stack rather than recursing per node
+        def find_max_depth(root):
+            max_depth = 0
+            stack = [(root, 0)]
+            while stack:
+                node, depth = stack.pop()
+                # Non-dict nodes, truncated nodes and nodes without children are leaves
+                children = node.get("children") if isinstance(node, dict) and "truncated" not in node else None
+                if children:
+                    stack.extend((child, depth + 1) for child in children)
+                elif depth > max_depth:
+                    max_depth = depth
+            return max_depth
 
         # Maximum depth should be limited
         max_depth = find_max_depth(result["tree"])
@@ -4,7 +4,24 @@ import os
 import tempfile
 
 import pytest
-import yaml
+
+# Written out literally so the fixture doesn't run the YAML emitter
+TEST_CONFIG_YAML = """\
+cache:
+  enabled: true
+  max_size_mb: 256
+  ttl_seconds: 3600
+security:
+  max_file_size_mb: 10
+  excluded_dirs:
+    - .git
+    - node_modules
+    - __pycache__
+    - .cache
+language:
+  auto_install: true
+  default_max_depth: 7
+"""
 
 # Import will fail initially until we implement the class
 
@@ -13,12 +30,7 @@ import yaml
 def temp_yaml_file():
     """Create a temporary YAML file with test configuration."""
     with tempfile.NamedTemporaryFile(suffix=".yaml", mode="w+", delete=False) as temp_file:
-        test_config = {
-            "cache": {"enabled": True, "max_size_mb": 256, "ttl_seconds": 3600},
-            "security": {"max_file_size_mb": 10, "excluded_dirs": [".git", "node_modules", "__pycache__", ".cache"]},
-            "language": {"auto_install": True, "default_max_depth": 7},
-        }
-        yaml.dump(test_config, temp_file)
+        temp_file.write(TEST_CONFIG_YAML)
         temp_file.flush()
         temp_file_path = temp_file.name
 
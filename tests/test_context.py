@@ -1,40 +1,46 @@
 """Tests for context.py module."""
 
 import logging
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import MagicMock, create_autospec, patch
 
 import pytest
 
 from mcp_server_tree_sitter.cache.parser_cache import TreeCache
-from mcp_server_tree_sitter.config import ConfigurationManager, ServerConfig
+from mcp_server_tree_sitter.config import ConfigurationManager
 from mcp_server_tree_sitter.context import ServerContext, global_context
 from mcp_server_tree_sitter.exceptions import ProjectError
 from mcp_server_tree_sitter.language.registry import LanguageRegistry
 from mcp_server_tree_sitter.models.project import ProjectRegistry
 
-
-@pytest.fixture
-def mock_dependencies():
-    """Fixture to create mock dependencies for ServerContext."""
-    config_manager = MagicMock(spec=ConfigurationManager)
-    project_registry = MagicMock(spec=ProjectRegistry)
-    language_registry = MagicMock(spec=LanguageRegistry)
-    tree_cache = MagicMock(spec=TreeCache)
-
-    # Set up config
-    config = MagicMock(spec=ServerConfig)
-    config.cache = MagicMock()
-    config.cache.enabled = True
-    config.cache.max_size_mb = 100
-    config.security = MagicMock()
-    config.security.max_file_size_mb = 5
-    config.language = MagicMock()
-    config.language.default_max_depth = 5
-    config.log_level = "INFO"
-
-    config_manager.get_config.return_value = config
+# Stand-in for logging's registry of named loggers; configure only iterates
+# over it, so one dict can be shared by every test that patches it in
+_FAKE_LOGGER_DICT = {"mcp_server_tree_sitter": None, "mcp_server_tree_sitter.test": None}
+
+
+@pytest.fixture(scope="module")
+def mock_templates():
+    """Build the autospecced mocks once per module.
+
+    create_autospec introspects the spec class and every method signature on
+    construction, so the mocks are reused and reset between tests instead of
+    rebuilt.
+    """
+    config_manager = create_autospec(ConfigurationManager, instance=True)
+    project_registry = create_autospec(ProjectRegistry, instance=True)
+    language_registry = create_autospec(LanguageRegistry, instance=True)
+    tree_cache = create_autospec(TreeCache, instance=True)
+
+    # Set up config; its values are only ever read, so plain namespaces suffice
+    config = SimpleNamespace(
+        cache=SimpleNamespace(enabled=True, max_size_mb=100),
+        security=SimpleNamespace(max_file_size_mb=5),
+        language=SimpleNamespace(default_max_depth=5),
+        log_level="INFO",
+    )
 
     return {
+        "config": config,
         "config_manager": config_manager,
         "project_registry": project_registry,
         "language_registry": language_registry,
@@ -42,6 +48,20 @@ def mock_dependencies():
     }
 
 
+@pytest.fixture
+def mock_dependencies(mock_templates):
+    """Fixture to provide freshly reset mock dependencies for ServerContext."""
+    dependencies = {name: mock for name, mock in mock_templates.items() if name != "config"}
+
+    # Clear call history plus any return values or side effects set by earlier tests
+    for mock in dependencies.values():
+        mock.reset_mock(return_value=True, side_effect=True)
+
+    dependencies["config_manager"].get_config.return_value = mock_templates["config"]
+
+    return dependencies
+
+
 @pytest.fixture
 def server_context(mock_dependencies):
     """Fixture to create a ServerContext instance with mock dependencies."""
@@ -53,43 +73,26 @@ def server_context(mock_dependencies):
     )
 
 
-def test_server_context_initialization(mock_dependencies):
-    """Test that ServerContext is initialized correctly with provided dependencies."""
-    context = ServerContext(
-        config_manager=mock_dependencies["config_manager"],
-        project_registry=mock_dependencies["project_registry"],
-        language_registry=mock_dependencies["language_registry"],
-        tree_cache=mock_dependencies["tree_cache"],
-    )
-
-    assert context.config_manager is mock_dependencies["config_manager"]
-    assert context.project_registry is mock_dependencies["project_registry"]
-    assert context.language_registry is mock_dependencies["language_registry"]
-    assert context.tree_cache is mock_dependencies["tree_cache"]
-
-
-@patch("mcp_server_tree_sitter.di.get_container")
-def test_server_context_initialization_with_container(mock_get_container, mock_dependencies):
-    """Test that ServerContext falls back to container when dependencies are not provided."""
-    container = MagicMock()
-    container.config_manager = mock_dependencies["config_manager"]
-    container.project_registry = mock_dependencies["project_registry"]
-    container.language_registry = mock_dependencies["language_registry"]
-    container.tree_cache = mock_dependencies["tree_cache"]
-
-    # Mock get_container() to return our container
-    mock_get_container.return_value = container
-
-    # Test directly injecting dependencies from container
-    # This is what happens when get_container() is called
-    context = ServerContext(
-        config_manager=container.config_manager,
-        project_registry=container.project_registry,
-        language_registry=container.language_registry,
-        tree_cache=container.tree_cache,
-    )
+@pytest.fixture
+def mock_logger():
+    """Patch logging.getLogger for one test and provide the logger it returns."""
+    with patch("logging.getLogger") as mock_get_logger:
+        logger = MagicMock()
+        mock_get_logger.return_value = logger
+        yield logger
+
+
+@pytest.mark.parametrize("use_container", [False, True], ids=["injected", "container"])
+def test_server_context_initialization(use_container, mock_dependencies):
+    """Test that ServerContext uses the dependencies it is given, or the container's when none are."""
+    if use_container:
+        # Serve the mocks from the container ServerContext falls back to
+        container = SimpleNamespace(**mock_dependencies)
+        with patch("mcp_server_tree_sitter.context.get_container", return_value=container):
+            context = ServerContext()
+    else:
+        context = ServerContext(**mock_dependencies)
 
-    # We're testing that the context correctly uses these injected dependencies
     assert context.config_manager is mock_dependencies["config_manager"]
     assert context.project_registry is mock_dependencies["project_registry"]
     assert context.language_registry is mock_dependencies["language_registry"]
@@ -196,13 +199,10 @@ def test_clear_cache_for_file(server_context, mock_dependencies):
     assert result == {"status": "success", "message": "Cache cleared for file.py in test_project"}
 
 
-@patch("logging.getLogger")
-def test_configure_with_yaml(mock_get_logger, server_context, mock_dependencies):
+def test_configure_with_yaml(mock_logger, server_context, mock_dependencies):
     """Test that configure loads a YAML config file."""
     # Setup
     config_manager = mock_dependencies["config_manager"]
-    mock_logger = MagicMock()
-    mock_get_logger.return_value = mock_logger
 
     # Call the method and discard result
     server_context.configure(config_path="/path/to/config.yaml")
@@ -240,24 +240,19 @@ def test_configure_max_file_size(server_context, mock_dependencies):
     config_manager.to_dict.assert_called_once()
 
 
-@patch("logging.getLogger")
-def test_configure_log_level(mock_get_logger, server_context, mock_dependencies):
+def test_configure_log_level(mock_logger, server_context, mock_dependencies):
     """Test that configure sets log_level correctly."""
     # Setup
     config_manager = mock_dependencies["config_manager"]
-    mock_root_logger = MagicMock()
-    mock_get_logger.return_value = mock_root_logger
 
     # Call the method
-    with patch(
-        "logging.root.manager.loggerDict", {"mcp_server_tree_sitter": None, "mcp_server_tree_sitter.test": None}
-    ):
+    with patch("logging.root.manager.loggerDict", _FAKE_LOGGER_DICT):
         # Call the method and discard result
         server_context.configure(log_level="DEBUG")
 
     # Verify
     config_manager.update_value.assert_called_once_with("log_level", "DEBUG")
-    mock_root_logger.setLevel.assert_called_with(logging.DEBUG)
+    mock_logger.setLevel.assert_called_with(logging.DEBUG)
     config_manager.to_dict.assert_called_once()
 
 
@@ -0,0 +1,7 @@
+"""Pytest configuration for the diagnostic tests."""
+
+import pytest
+
+# The diagnostic fixture comes from the testing plugin; skip the whole
+# directory once here rather than in each module if it is unavailable
+pytest.importorskip("mcp_server_tree_sitter.testing")
@@ -1,43 +1,21 @@
 """Example of using pytest with diagnostic plugin for testing."""
 
-import tempfile
-from pathlib import Path
-
 import pytest
 
-from mcp_server_tree_sitter.api import get_project_registry
-from mcp_server_tree_sitter.language.registry import LanguageRegistry
-from tests.test_helpers import get_ast, register_project_tool
-
-# Load the diagnostic fixture
-pytest.importorskip("mcp_server_tree_sitter.testing")
-
-
-@pytest.fixture
-def test_project():
-    """Create a temporary test project with a sample file."""
-    # Set up a temporary directory
-    with tempfile.TemporaryDirectory() as temp_dir:
-        project_path = Path(temp_dir)
-
-        # Create a test file
-        test_file = project_path / "test.py"
-        with open(test_file, "w") as f:
-            f.write("def hello():\n    print('Hello, world!')\n\nhello()\n")
+from tests.test_helpers import get_ast
 
-        # Register project
-        project_name = "diagnostic_test_project"
-        register_project_tool(path=str(project_path), name=project_name)
+SAMPLE_SOURCE = b"def hello():\n    print('Hello, world!')\n\nhello()\n"
 
-        # Yield the project info
-        yield {"name": project_name, "path": project_path, "file": "test.py"}
+# Files written to the shared project directory (see conftest.py)
+PROJECT_FILES = {"test.py": SAMPLE_SOURCE}
 
-        # Clean up
-        project_registry = get_project_registry()
-        try:
-            project_registry.remove_project(project_name)
-        except Exception:
-            pass
+# File names and the language each should be detected as
+LANGUAGE_DETECTION_CASES = (
+    ("test.py", "python"),
+    ("test.js", "javascript"),
+    ("test.ts", "typescript"),
+    ("test.unknown", None),
+)
 
 
 @pytest.mark.diagnostic
@@ -84,35 +62,14 @@ def test_ast_failure(test_project, diagnostic) -> None:
 
 
 @pytest.mark.diagnostic
-def test_language_detection(diagnostic) -> None:
+@pytest.mark.parametrize(
+    "filename,expected", LANGUAGE_DETECTION_CASES, ids=[case[0] for case in LANGUAGE_DETECTION_CASES]
+)
+def test_language_detection(language_registry, diagnostic, filename, expected) -> None:
     """Test language detection functionality."""
-    registry = LanguageRegistry()
-
-    # Test a few common file extensions
-    test_files = {
-        "test.py": "python",
-        "test.js": "javascript",
-        "test.ts": "typescript",
-        "test.unknown": None,
-    }
-
-    results = {}
-    failures = []
-
-    for filename, expected in test_files.items():
-        detected = registry.language_for_file(filename)
-        match = detected == expected
-
-        results[filename] = {"detected": detected, "expected": expected, "match": match}
-
-        if not match:
-            failures.append(filename)
+    detected = language_registry.language_for_file(filename)
 
-    # Add all results to diagnostic data
-    diagnostic.add_detail("detection_results", results)
-    if failures:
-        diagnostic.add_detail("failed_files", failures)
+    # Add the result to diagnostic data
+    diagnostic.add_detail("detection_result", {"filename": filename, "detected": detected, "expected": expected})
 
-    # Check results with proper assertions
-    for filename, expected in test_files.items():
-        assert registry.language_for_file(filename) == expected, f"Language detection failed for {filename}"
+    assert detected == expected, f"Language detection failed for {filename}"
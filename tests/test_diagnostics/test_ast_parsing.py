@@ -1,63 +1,27 @@
 """Pytest-based diagnostic tests for AST parsing functionality."""
 
-import tempfile
 from pathlib import Path
-from typing import Any, Dict, Generator, Tuple
+from typing import Any, Tuple
 
 import pytest
 
-from mcp_server_tree_sitter.api import get_language_registry, get_project_registry, get_tree_cache
+from mcp_server_tree_sitter.api import get_project_registry, get_tree_cache
+from mcp_server_tree_sitter.language.registry import LanguageRegistry
 from mcp_server_tree_sitter.models.ast import node_to_dict
-from tests.test_helpers import get_ast, register_project_tool
+from tests.test_helpers import get_ast
 
+SAMPLE_SOURCE = b"def hello():\n    print('Hello, world!')\n\nhello()\n"
 
-@pytest.fixture
-def test_project() -> Generator[Dict[str, Any], None, None]:
-    """Create a temporary test project with a sample file."""
-    # Set up a temporary directory
-    with tempfile.TemporaryDirectory() as temp_dir:
-        project_path = Path(temp_dir)
+# Files written to the shared project directory (see conftest.py)
+PROJECT_FILES = {"test.py": SAMPLE_SOURCE}
 
-        # Create a test file
-        test_file = project_path / "test.py"
-        with open(test_file, "w") as f:
-            f.write("def hello():\n    print('Hello, world!')\n\nhello()\n")
 
-        # Register project
-        project_registry = get_project_registry()
-        project_name = "ast_test_project"
-        try:
-            register_project_tool(path=str(project_path), name=project_name)
-        except Exception:
-            # If registration fails, try again with timestamp
-            import time
-
-            project_name = f"ast_test_project_{int(time.time())}"
-            register_project_tool(path=str(project_path), name=project_name)
-
-        # Yield the project info
-        yield {"name": project_name, "path": project_path, "file": "test.py"}
-
-        # Clean up
-        try:
-            project_registry.remove_project(project_name)
-        except Exception:
-            pass
-
-
-def parse_file(file_path: Path, language: str) -> Tuple[Any, bytes]:
+def parse_file(file_path: Path, language: str, language_registry: LanguageRegistry) -> Tuple[Any, bytes]:
     """Replacement for the relocated parse_file function."""
-    language_registry = get_language_registry()
-    tree_cache = get_tree_cache()
-
-    # Get language object
-    # We don't need to store language_obj directly as it's used by ast_parse_file
-    _ = language_registry.get_language(language)
-
     # Use the tools.ast_operations.parse_file function
     from mcp_server_tree_sitter.tools.ast_operations import parse_file as ast_parse_file
 
-    return ast_parse_file(file_path, language, language_registry, tree_cache)
+    return ast_parse_file(file_path, language, language_registry, get_tree_cache())
 
 
 @pytest.mark.diagnostic
@@ -107,20 +71,22 @@ def test_get_ast_functionality(test_project, diagnostic) -> None:
 
 
 @pytest.mark.diagnostic
-def test_direct_parsing(test_project, diagnostic) -> None:
+def test_direct_parsing(test_project, language_registry, diagnostic) -> None:
     """Test lower-level parse_file function to isolate issues."""
-    file_path = test_project["path"] / test_project["file"]
+    # Resolve the path the way get_ast does, so a tree that an earlier get_ast
+    # call left in the tree cache is reused instead of parsed again
+    project = get_project_registry().get_project(test_project["name"])
+    file_path = project.get_file_path(test_project["file"])
     diagnostic.add_detail("file_path", str(file_path))
 
     try:
         # Get language
-        registry = get_language_registry()
-        language = registry.language_for_file(test_project["file"])
+        language = language_registry.language_for_file(test_project["file"])
         assert language is not None, "Could not detect language for file"
         language_obj = None
 
         try:
-            language_obj = registry.get_language(language)
+            language_obj = language_registry.get_language(language)
             diagnostic.add_detail("language_loaded", True)
             diagnostic.add_detail("language", language)
         except Exception as e:
@@ -130,55 +96,51 @@ def test_direct_parsing(test_project, diagnostic) -> None:
 
         # Try direct parsing if language is loaded
         if language_obj:
+            diagnostic.add_detail("tree_cache_hit", get_tree_cache().get(file_path, language) is not None)
             try:
-                tree, source_bytes = parse_file(file_path, language) if language is not None else (None, None)
+                tree, source_bytes = parse_file(file_path, language, language_registry)
 
                 parsing_info = {
                     "status": "success",
                     "tree_type": type(tree).__name__,
-                    "has_root_node": hasattr(tree, "root_node"),
                 }
                 diagnostic.add_detail("parsing", parsing_info)
 
-                # Try to access the root node
-                if tree is not None and hasattr(tree, "root_node"):
-                    root = tree.root_node
-                    root_info = {
-                        "type": root.type,
-                        "start_byte": root.start_byte,
-                        "end_byte": root.end_byte,
-                        "child_count": (len(root.children) if hasattr(root, "children") else -1),
-                    }
-                    diagnostic.add_detail("root_node", root_info)
-
-                    # Try to convert to dict
-                    try:
-                        node_dict = node_to_dict(root, source_bytes, max_depth=2)
-                        diagnostic.add_detail(
-                            "node_to_dict",
-                            {
-                                "status": "success",
-                                "keys": list(node_dict.keys()),
-                            },
-                        )
-
-                        # Assert dictionary structure
-                        assert "type" in node_dict, "node_dict should contain type"
-                        assert "children" in node_dict or "truncated" in node_dict, (
-                            "node_dict should contain children or be truncated"
-                        )
-
-                        # Check for error in node dictionary
-                        if "error" in node_dict:
-                            raise AssertionError(f"node_dict contains an error: {node_dict['error']}")
-
-                    except Exception as e:
-                        diagnostic.add_error("NodeToDictError", str(e))
-                        pytest.fail(f"node_to_dict failed: {e}")
-
-                else:
-                    diagnostic.add_error("NoRootNodeError", "Tree has no root_node attribute")
-                    pytest.fail("Tree has no root_node attribute")
+                # Access the root node directly: every Tree has one, and a
+                # missing attribute should fail with its own traceback
+                root = tree.root_node
+                root_info = {
+                    "type": root.type,
+                    "start_byte": root.start_byte,
+                    "end_byte": root.end_byte,
+                    "child_count": root.child_count,
+                }
+                diagnostic.add_detail("root_node", root_info)
+
+                # Try to convert to dict
+                try:
+                    node_dict = node_to_dict(root, source_bytes, max_depth=2)
+                    diagnostic.add_detail(
+                        "node_to_dict",
+                        {
+                            "status": "success",
+                            "keys": list(node_dict.keys()),
+                        },
+                    )
+
+                    # Assert dictionary structure
+                    assert "type" in node_dict, "node_dict should contain type"
+                    assert "children" in node_dict or "truncated" in node_dict, (
+                        "node_dict should contain children or be truncated"
+                    )
+
+                    # Check for error in node dictionary
+                    if "error" in node_dict:
+                        raise AssertionError(f"node_dict contains an error: {node_dict['error']}")
+
+                except Exception as e:
+                    diagnostic.add_error("NodeToDictError", str(e))
+                    pytest.fail(f"node_to_dict failed: {e}")
 
             except Exception as e:
                 diagnostic.add_error("ParsingError", str(e))
@@ -1,61 +1,85 @@
 """Pytest-based diagnostic tests for cursor-based AST functionality."""
 
-import tempfile
 from pathlib import Path
-from typing import Any, Dict, Generator, Tuple
+from typing import Any, Optional, Tuple
 
 import pytest
 
-from mcp_server_tree_sitter.api import get_language_registry, get_project_registry
+from mcp_server_tree_sitter.api import get_tree_cache
+from mcp_server_tree_sitter.language.registry import LanguageRegistry
 from mcp_server_tree_sitter.models.ast import node_to_dict
 from mcp_server_tree_sitter.models.ast_cursor import node_to_dict_cursor
-from tests.test_helpers import register_project_tool
 
+SAMPLE_SOURCE = b"def hello():\n    print('Hello, world!')\n\nhello()\n"
 
-def parse_file(file_path: Path, language: str) -> Tuple[Any, bytes]:
-    """Replacement for the relocated parse_file function."""
-    language_registry = get_language_registry()
+# A larger Python file with several classes and functions
+LARGE_SOURCE = """
+# Test file with multiple classes and functions
+import os
+import sys
+from typing import List, Dict, Optional
 
-    # Get language object
-    # We don't need to store language_obj directly as it's used by ast_parse_file
-    _ = language_registry.get_language(language)
+class Person:
+    def __init__(self, name: str, age: int):
+        self.name = name
+        self.age = age
 
-    # Use the tools.ast_operations.parse_file function
-    from mcp_server_tree_sitter.api import get_tree_cache
-    from mcp_server_tree_sitter.tools.ast_operations import parse_file as ast_parse_file
+    def greet(self) -> str:
+        return f"Hello, my name is {self.name} and I'm {self.age} years old."
 
-    return ast_parse_file(file_path, language, language_registry, get_tree_cache())
+    def celebrate_birthday(self) -> None:
+        self.age += 1
+        print(f"Happy Birthday! {self.name} is now {self.age}!")
 
+class Employee(Person):
+    def __init__(self, name: str, age: int, employee_id: str):
+        super().__init__(name, age)
+        self.employee_id = employee_id
 
-@pytest.fixture
-def test_project() -> Generator[Dict[str, Any], None, None]:
-    """Create a temporary test project with a sample file."""
-    # Set up a temporary directory
-    with tempfile.TemporaryDirectory() as temp_dir:
-        project_path = Path(temp_dir)
+    def greet(self) -> str:
+        return f"{super().greet()} I work here and my ID is {self.employee_id}."
 
-        # Create a test file
-        test_file = project_path / "test.py"
-        with open(test_file, "w") as f:
-            f.write("def hello():\n    print('Hello, world!')\n\nhello()\n")
+def process_people(people: List[Person]) -> Dict[str, int]:
+    result = {}
+    for person in people:
+        result[person.name] = person.age
+    return result
 
-        # Register project
-        project_registry = get_project_registry()
-        project_name = "cursor_test_project"
-        register_project_tool(path=str(project_path), name=project_name)
+if __name__ == "__main__":
+    p1 = Person("Alice", 30)
+    p2 = Person("Bob", 25)
+    e1 = Employee("Charlie", 35, "E12345")
 
-        # Yield the project info
-        yield {"name": project_name, "path": project_path, "file": "test.py"}
+    print(p1.greet())
+    print(p2.greet())
+    print(e1.greet())
+
+    results = process_people([p1, p2, e1])
+    print(f"Results: {results}")
+"""
+
+# Files written to the shared project directory (see conftest.py)
+PROJECT_FILES = {"test.py": SAMPLE_SOURCE, "large.py": LARGE_SOURCE}
 
-        # Clean up
-        try:
-            project_registry.remove_project(project_name)
-        except Exception:
-            pass
+
+def parse_file(
+    file_path: Path, language: str, language_registry: LanguageRegistry, source_bytes: Optional[bytes] = None
+) -> Tuple[Any, bytes]:
+    """Replacement for the relocated parse_file function.
+
+    When source_bytes is given it is parsed directly and the file is not read.
+    """
+    if source_bytes is not None:
+        return language_registry.get_parser(language).parse(source_bytes), source_bytes
+
+    # Use the tools.ast_operations.parse_file function
+    from mcp_server_tree_sitter.tools.ast_operations import parse_file as ast_parse_file
+
+    return ast_parse_file(file_path, language, language_registry, get_tree_cache())
 
 
 @pytest.mark.diagnostic
-def test_cursor_ast_implementation(test_project, diagnostic) -> None:
+def test_cursor_ast_implementation(test_project, language_registry, diagnostic) -> None:
     """Test the cursor-based AST implementation."""
     # Add test details to diagnostic data
     diagnostic.add_detail("project", test_project["name"])
@@ -63,14 +87,13 @@ def test_cursor_ast_implementation(test_project, diagnostic) -> None:
 
     try:
         # Get language
-        registry = get_language_registry()
-        language = registry.language_for_file(test_project["file"])
+        language = language_registry.language_for_file(test_project["file"])
         assert language is not None, "Could not detect language for file"
-        _language_obj = registry.get_language(language)
+        _language_obj = language_registry.get_language(language)
 
-        # Parse file
+        # Parse the sample source from memory; only the large-file test needs the disk
         file_path = test_project["path"] / test_project["file"]
-        tree, source_bytes = parse_file(file_path, language)
+        tree, source_bytes = parse_file(file_path, language, language_registry, SAMPLE_SOURCE)
 
         # Get AST using cursor-based approach
         cursor_ast = node_to_dict_cursor(tree.root_node, source_bytes, max_depth=3)
@@ -128,70 +151,22 @@ def test_cursor_ast_implementation(test_project, diagnostic) -> None:
 
 
 @pytest.mark.diagnostic
-def test_large_ast_handling(test_project, diagnostic) -> None:
+def test_large_ast_handling(test_project, language_registry, diagnostic) -> None:
     """Test handling of a slightly larger AST to ensure cursor-based approach works."""
     # Add test details to diagnostic data
     diagnostic.add_detail("project", test_project["name"])
 
     try:
-        # Create a larger Python file with more structures
+        # The larger file is written once by the project_dir fixture
         large_file_path = test_project["path"] / "large.py"
-        with open(large_file_path, "w") as f:
-            f.write(
-                """
-# Test file with multiple classes and functions
-import os
-import sys
-from typing import List, Dict, Optional
-
-class Person:
-    def __init__(self, name: str, age: int):
-        self.name = name
-        self.age = age
-
-    def greet(self) -> str:
-        return f"Hello, my name is {self.name} and I'm {self.age} years old."
-
-    def celebrate_birthday(self) -> None:
-        self.age += 1
-        print(f"Happy Birthday! {self.name} is now {self.age}!")
-
-class Employee(Person):
-    def __init__(self, name: str, age: int, employee_id: str):
-        super().__init__(name, age)
-        self.employee_id = employee_id
-
-    def greet(self) -> str:
-        return f"{super().greet()} I work here and my ID is {self.employee_id}."
-
-def process_people(people: List[Person]) -> Dict[str, int]:
-    result = {}
-    for person in people:
-        result[person.name] = person.age
-    return result
-
-if __name__ == "__main__":
-    p1 = Person("Alice", 30)
-    p2 = Person("Bob", 25)
-    e1 = Employee("Charlie", 35, "E12345")
-
-    print(p1.greet())
-    print(p2.greet())
-    print(e1.greet())
-
-    results = process_people([p1, p2, e1])
-    print(f"Results: {results}")
-"""
-            )
 
         # Get language
-        registry = get_language_registry()
-        language = registry.language_for_file("large.py")
+        language = language_registry.language_for_file("large.py")
         assert language is not None, "Could not detect language for large.py"
-        _language_obj = registry.get_language(language)
+        _language_obj = language_registry.get_language(language)
 
         # Parse file
-        tree, source_bytes = parse_file(large_file_path, language)
+        tree, source_bytes = parse_file(large_file_path, language, language_registry)
 
         # Get AST using cursor-based approach
         cursor_ast = node_to_dict(tree.root_node, source_bytes, max_depth=5)
@@ -200,29 +175,34 @@ if __name__ == "__main__":
         diagnostic.add_detail("large_ast_type", cursor_ast["type"])
         diagnostic.add_detail("large_ast_children_count", cursor_ast.get("children_count", 0))
 
-        # Find class and function counts
-        class_nodes = []
-        function_nodes = []
-
-        def count_nodes(node_dict) -> None:
-            if node_dict["type"] == "class_definition":
-                class_nodes.append(node_dict["id"])
-            elif node_dict["type"] == "function_definition":
-                function_nodes.append(node_dict["id"])
-
-            if "children" in node_dict:
-                for child in node_dict["children"]:
-                    count_nodes(child)
-
-        count_nodes(cursor_ast)
+        # Count classes and functions over the native tree with one cursor,
+        # rather than recursing through the depth-limited dict
+        class_count = 0
+        function_count = 0
+        cursor = tree.walk()
+        walking = True
+        while walking:
+            node_type = cursor.node.type
+            if node_type == "class_definition":
+                class_count += 1
+            elif node_type == "function_definition":
+                function_count += 1
+
+            if cursor.goto_first_child():
+                continue
+            # Climb until a node has a next sibling; back at the root means done
+            while not cursor.goto_next_sibling():
+                if not cursor.goto_parent():
+                    walking = False
+                    break
 
         # Report counts
-        diagnostic.add_detail("class_count", len(class_nodes))
-        diagnostic.add_detail("function_count", len(function_nodes))
+        diagnostic.add_detail("class_count", class_count)
+        diagnostic.add_detail("function_count", function_count)
 
         # Basic validation
-        assert len(class_nodes) >= 2, "Should find at least 2 classes"
-        assert len(function_nodes) >= 5, "Should find at least 5 functions/methods"
+        assert class_count >= 2, "Should find at least 2 classes"
+        assert function_count >= 5, "Should find at least 5 functions/methods"
 
         # Success!
         diagnostic.add_detail("large_ast_success", True)
@@ -4,6 +4,13 @@ import sys
 
 import pytest
 
+# Import the language pack once for _get_language_binding; a missing pack is
+# reported by test_language_pack_import instead of failing collection
+try:
+    from tree_sitter_language_pack import get_language, get_parser
+except ImportError:
+    get_language = get_parser = None  # type: ignore
+
 
 @pytest.mark.diagnostic
 def test_tree_sitter_import(diagnostic) -> None:
@@ -135,7 +142,8 @@ def test_language_binding_available(diagnostic) -> None:
 def _get_language_binding(language_name) -> dict:
     """Helper method to test getting a language binding from the language pack."""
     try:
-        from tree_sitter_language_pack import get_language, get_parser
+        if get_language is None or get_parser is None:
+            raise ImportError("tree_sitter_language_pack not available")
 
         # Get language (may raise exception)
         language = get_language(language_name)
@@ -2,13 +2,10 @@
 
 import pytest
 
-from mcp_server_tree_sitter.language.registry import LanguageRegistry
-
 
 @pytest.mark.diagnostic
-def test_language_detection(diagnostic) -> None:
+def test_language_detection(language_registry, diagnostic) -> None:
     """Test language detection functionality."""
-    registry = LanguageRegistry()
 
     # Test a few common file extensions
     test_files = {
@@ -22,11 +19,14 @@ def test_language_detection(diagnostic) -> None:
         "test.unknown": None,
     }
 
+    # Detect each file once and reuse the result for diagnostics and assertions
+    detected_map = {filename: language_registry.language_for_file(filename) for filename in test_files}
+
     results = {}
     failures = []
 
     for filename, expected in test_files.items():
-        detected = registry.language_for_file(filename)
+        detected = detected_map[filename]
         match = detected == expected
 
         results[filename] = {"detected": detected, "expected": expected, "match": match}
@@ -41,17 +41,16 @@ def test_language_detection(diagnostic) -> None:
 
     # Check results with proper assertions
     for filename, expected in test_files.items():
-        assert registry.language_for_file(filename) == expected, f"Language detection failed for {filename}"
+        assert detected_map[filename] == expected, f"Language detection failed for {filename}"
 
 
 @pytest.mark.diagnostic
-def test_language_list_empty(diagnostic) -> None:
+def test_language_list_empty(language_registry, diagnostic) -> None:
     """Test that list_languages returns languages correctly."""
-    registry = LanguageRegistry()
 
     # Get available languages
-    available_languages = registry.list_available_languages()
-    installable_languages = registry.list_installable_languages()
+    available_languages = language_registry.list_available_languages()
+    installable_languages = language_registry.list_installable_languages()
 
     # Add results to diagnostic data
     diagnostic.add_detail("available_languages", available_languages)
@@ -83,9 +82,8 @@ def test_language_list_empty(diagnostic) -> None:
 
 
 @pytest.mark.diagnostic
-def test_language_detection_vs_listing(diagnostic) -> None:
+def test_language_detection_vs_listing(language_registry, diagnostic) -> None:
     """Test discrepancy between language detection and language listing."""
-    registry = LanguageRegistry()
 
     # Test with a few common languages
     test_languages = [
@@ -102,10 +100,10 @@ def test_language_detection_vs_listing(diagnostic) -> None:
     for lang in test_languages:
         try:
             # Check if language is available
-            if registry.is_language_available(lang):
+            if language_registry.is_language_available(lang):
                 results[lang] = {
                     "available": True,
-                    "language_object": bool(registry.get_language(lang) is not None),
+                    "language_object": bool(language_registry.get_language(lang) is not None),
                     "reason": "",
                 }
             else:
@@ -118,7 +116,7 @@ def test_language_detection_vs_listing(diagnostic) -> None:
             results[lang] = {"available": False, "error": str(e), "language_object": False}
 
     # Check if languages reported as available appear in list_languages
-    available_languages = registry.list_available_languages()
+    available_languages = language_registry.list_available_languages()
 
     # Add results to diagnostic data
     diagnostic.add_detail("language_results", results)
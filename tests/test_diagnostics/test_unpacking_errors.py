@@ -1,27 +1,11 @@
 """Pytest-based diagnostic tests for the unpacking errors in analysis functions."""
 
-import tempfile
-from pathlib import Path
-from typing import Any, Dict, Generator
-
 import pytest
 
-from mcp_server_tree_sitter.api import get_project_registry
-from tests.test_helpers import analyze_complexity, get_dependencies, get_symbols, register_project_tool, run_query
-
-
-@pytest.fixture
-def test_project() -> Generator[Dict[str, Any], None, None]:
-    """Create a temporary test project with a sample file."""
-    # Set up a temporary directory
-    with tempfile.TemporaryDirectory() as temp_dir:
-        project_path = Path(temp_dir)
+from tests.test_helpers import analyze_complexity, get_dependencies, get_symbols, run_query
 
-        # Create a sample Python file
-        test_file = project_path / "test.py"
-        with open(test_file, "w") as f:
-            f.write(
-                """
+# Sample file for unpacking errors; the tests only read it
+SAMPLE_SOURCE = """
 # Test file for unpacking errors
 import os
 import sys
@@ -41,21 +25,9 @@ if __name__ == "__main__":
     person = Person("World")
     print(person.greet())
 """
-            )
-
-        # Register project
-        project_name = "unpacking_test_project"
-        register_project_tool(path=str(project_path), name=project_name)
-
-        # Yield the project info
-        yield {"name": project_name, "path": project_path, "file": "test.py"}
 
-        # Clean up
-        project_registry = get_project_registry()
-        try:
-            project_registry.remove_project(project_name)
-        except Exception:
-            pass
+# Files written to the shared project directory (see conftest.py)
+PROJECT_FILES = {"test.py": SAMPLE_SOURCE}
 
 
 @pytest.mark.diagnostic
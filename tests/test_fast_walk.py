@@ -0,0 +1,55 @@
+"""Tests for the scandir-based directory walker."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from mcp_server_tree_sitter.utils.fast_walk import compile_glob, walk
+
+
+@pytest.fixture
+def tree(tmp_path: Path) -> Path:
+    """Create a small directory tree with ignored and nested directories."""
+    (tmp_path / "top.py").write_text("x = 1\n")
+    (tmp_path / "notes.txt").write_text("notes\n")
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "mod.py").write_text("y = 2\n")
+    (tmp_path / "pkg" / "mod.pyc").write_bytes(b"\x00\x01")
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "dep.py").write_text("z = 3\n")
+    return tmp_path
+
+
+def _rel(paths, root: Path):
+    return sorted(os.path.relpath(p, root).replace(os.sep, "/") for p in paths)
+
+
+def test_walk_prunes_ignored_dirs(tree: Path) -> None:
+    """Ignored directories are never descended into."""
+    assert _rel(walk(tree), tree) == ["notes.txt", "pkg/mod.py", "pkg/mod.pyc", "top.py"]
+    assert "node_modules/dep.py" in _rel(walk(tree, ignore_dirs=frozenset()), tree)
+
+
+def test_walk_filters_extensions(tree: Path) -> None:
+    """Only files with one of the requested extensions are yielded."""
+    assert _rel(walk(tree, exts={"py"}), tree) == ["pkg/mod.py", "top.py"]
+
+
+@pytest.mark.parametrize(
+    "pattern,path,expected",
+    [
+        ("**/*.py", "top.py", True),
+        ("**/*.py", "pkg/mod.py", True),
+        ("**/*.py", "pkg/mod.pyc", False),
+        ("*.py", "top.py", True),
+        ("*.py", "pkg/mod.py", False),
+        ("pkg/*.py", "pkg/mod.py", True),
+        ("pkg/**", "pkg/sub/mod.py", True),
+        ("[mn]*.txt", "notes.txt", True),
+        ("[!n]*.txt", "notes.txt", False),
+    ],
+)
+def test_compile_glob_matches_pathlib_semantics(pattern: str, path: str, expected: bool) -> None:
+    """Compiled globs follow Path.glob rules for '*' and '**'."""
+    assert bool(compile_glob(pattern).match(path)) is expected
@@ -0,0 +1,95 @@
+"""Tests for file_io.py module."""
+
+from pathlib import Path
+
+import pytest
+
+from mcp_server_tree_sitter.utils.file_io import (
+    get_comment_prefix,
+    get_file_content_and_lines,
+    parse_file_with_encoding,
+    read_binary_file,
+    read_file_lines,
+    read_text_file,
+)
+
+
+def test_get_file_content_and_lines(tmp_path: Path) -> None:
+    """Binary content and decoded lines come from a single read."""
+    path = tmp_path / "sample.py"
+    path.write_bytes("x = 'é'\nprint(x)\n".encode("utf-8"))
+
+    content, lines = get_file_content_and_lines(path)
+
+    assert content == path.read_bytes()
+    assert lines == ["x = 'é'\n", "print(x)\n"]
+    assert (content, lines) == parse_file_with_encoding(path)
+
+
+def test_get_file_content_and_lines_invalid_utf8(tmp_path: Path) -> None:
+    """Undecodable bytes are replaced rather than raising."""
+    path = tmp_path / "bad.txt"
+    path.write_bytes(b"ok\n\xff\n")
+
+    content, lines = get_file_content_and_lines(path)
+
+    assert content == b"ok\n\xff\n"
+    assert lines == ["ok\n", "\ufffd\n"]
+
+
+def test_get_file_content_and_lines_matches_read_text_file(tmp_path: Path) -> None:
+    """Decoded lines follow universal newlines, exactly like read_text_file."""
+    path = tmp_path / "mixed.txt"
+    path.write_bytes(b"a\r\nb\x0cc\rd\x0be\n\xc2\x85f\n")
+
+    _, lines = get_file_content_and_lines(path)
+
+    assert lines == ["a\n", "b\x0cc\n", "d\x0be\n", "\x85f\n"]
+    assert lines == read_text_file(path)
+
+
+def test_parse_file_with_encoding_universal_newlines(tmp_path: Path) -> None:
+    """CRLF and CR line endings come back as plain newlines in the given encoding."""
+    path = tmp_path / "crlf.txt"
+    path.write_bytes("caf\xe9\r\nb\x0cc\rd\n".encode("latin-1"))
+
+    content, lines = parse_file_with_encoding(path, encoding="latin-1")
+
+    assert content == path.read_bytes()
+    assert lines == ["caf\xe9\n", "b\x0cc\n", "d\n"]
+
+
+def test_read_binary_file(tmp_path: Path) -> None:
+    """Whole files are read exactly, including empty and larger-than-chunk files."""
+    empty = tmp_path / "empty.bin"
+    empty.write_bytes(b"")
+    assert read_binary_file(empty) == b""
+
+    data = bytes(range(256)) * 1024
+    large = tmp_path / "large.bin"
+    large.write_bytes(data)
+    assert read_binary_file(str(large)) == data
+
+
+def test_read_binary_file_missing(tmp_path: Path) -> None:
+    """Missing files raise the same error as open()."""
+    with pytest.raises(FileNotFoundError):
+        read_binary_file(tmp_path / "missing.bin")
+
+
+def test_get_comment_prefix() -> None:
+    """Known languages map to their line comment prefix."""
+    assert get_comment_prefix("python") == "#"
+    assert get_comment_prefix("rust") == "//"
+    assert get_comment_prefix("unknown") is None
+
+
+def test_read_file_lines(tmp_path: Path) -> None:
+    """A window of lines is returned without padding past the end of the file."""
+    path = tmp_path / "lines.txt"
+    path.write_text("a\nb\nc\nd\n")
+
+    assert read_file_lines(path) == ["a\n", "b\n", "c\n", "d\n"]
+    assert read_file_lines(path, start_line=1, max_lines=2) == ["b\n", "c\n"]
+    assert read_file_lines(path, start_line=3, max_lines=5) == ["d\n"]
+    assert read_file_lines(path, start_line=10) == []
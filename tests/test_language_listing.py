@@ -71,6 +71,41 @@ def test_server_language_tools() -> None:
         assert "message" in result, "Missing 'message' key in check_language_available result"
 
 
+def test_extensions_for_language() -> None:
+    """Test that extension lookups are cached and can be invalidated."""
+    registry = LanguageRegistry()
+
+    assert registry.extensions_for_language("cpp") == {"cpp", "cc", "hpp"}
+    assert registry.extensions_for_language("not_a_language") == frozenset()
+
+    registry._language_map["cxx"] = "cpp"
+    assert "cxx" not in registry.extensions_for_language("cpp")
+
+    registry.clear_extension_cache()
+    assert "cxx" in registry.extensions_for_language("cpp")
+
+
+def test_is_language_available_remembers_failures(monkeypatch) -> None:
+    """Test that a language that failed to load is not probed again."""
+    registry = LanguageRegistry()
+    probes = []
+    original_get_language = registry.get_language
+
+    def counting_get_language(language_name):
+        probes.append(language_name)
+        return original_get_language(language_name)
+
+    monkeypatch.setattr(registry, "get_language", counting_get_language)
+
+    assert not registry.is_language_available("not_a_language")
+    assert not registry.is_language_available("not_a_language")
+    assert probes == ["not_a_language"]
+
+    assert registry.is_language_available("python")
+    assert registry.is_language_available("python")
+    assert probes == ["not_a_language", "python"]
+
+
 if __name__ == "__main__":
     test_list_available_languages()
     test_language_api_consistency()
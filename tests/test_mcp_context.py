@@ -305,3 +305,22 @@ def test_mcp_context_try_get_mcp_context():
     # Test with None
     context = MCPContext(None)
     assert context.try_get_mcp_context() is None
+
+
+def test_mcp_context_report_progress_is_throttled(mock_mcp_context):
+    """Test that rapid intermediate progress reports are coalesced."""
+    context = MCPContext(mock_mcp_context)
+
+    # 1000 steps: only the first report, whole-percent boundaries and the
+    # final report are sent when updates arrive faster than the interval
+    for current in range(1001):
+        context.report_progress(current, 1000)
+
+    reported = [c.args for c in mock_mcp_context.report_progress.call_args_list]
+    assert reported[0] == (0, 1000)
+    assert reported[-1] == (1000, 1000)
+    assert len(reported) < 200
+
+    # Local state always reflects the latest update
+    assert context.current_step == 1000
+    assert context.total_steps == 1000
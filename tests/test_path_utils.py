@@ -0,0 +1,34 @@
+"""Tests for path.py module."""
+
+from pathlib import Path
+
+import pytest
+
+from mcp_server_tree_sitter.utils.path import get_project_root, safe_relative_path
+
+
+def test_get_project_root_finds_nearest_marker(tmp_path: Path) -> None:
+    """The closest ancestor containing a project marker is returned."""
+    project = tmp_path / "project"
+    nested = project / "src" / "pkg"
+    nested.mkdir(parents=True)
+    (project / "pyproject.toml").write_text("")
+    source = nested / "mod.py"
+    source.write_text("x = 1\n")
+
+    assert get_project_root(source) == project.resolve()
+    assert get_project_root(nested) == project.resolve()
+
+    # A marker directory (not just a file) also counts
+    (nested / ".git").mkdir()
+    assert get_project_root(source) == nested.resolve()
+
+
+def test_safe_relative_path(tmp_path: Path) -> None:
+    """Paths inside the base are made relative; others are rejected."""
+    (tmp_path / "a").mkdir()
+    assert safe_relative_path(tmp_path / "a" / "b.py", tmp_path) == Path("a/b.py")
+    assert safe_relative_path(tmp_path / "a" / ".." / "c.py", tmp_path) == Path("c.py")
+
+    with pytest.raises(ValueError):
+        safe_relative_path(tmp_path.parent / "other.py", tmp_path)
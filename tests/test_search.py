@@ -0,0 +1,191 @@
+"""Tests for the text search and query tools."""
+
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict
+
+import pytest
+
+from mcp_server_tree_sitter.api import get_language_registry, get_tree_cache
+from mcp_server_tree_sitter.exceptions import QueryError
+from mcp_server_tree_sitter.models.project import Project
+from mcp_server_tree_sitter.tools.search import _iter_captures, query_code, search_text
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Project:
+    """Create a project with Python sources in nested and ignored directories."""
+    (tmp_path / "main.py").write_text("def main():\n    print('Hello World')\n\nmain()\n")
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "util.py").write_text("def helper():\n    return 'hello'\n")
+    (tmp_path / "pkg" / "notes.txt").write_text("hello from notes\n")
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "dep.py").write_text("def dep():\n    return 'hello'\n")
+    return Project("search_test", tmp_path)
+
+
+def test_search_text_finds_matches_in_nested_files(project: Project) -> None:
+    """Case-insensitive search covers the whole tree except excluded directories."""
+    results = search_text(project, "hello")
+    assert sorted(r["file"] for r in results) == ["main.py", "pkg/notes.txt", "pkg/util.py"]
+
+
+def test_search_text_file_pattern(project: Project) -> None:
+    """The file pattern is applied with Path.glob semantics."""
+    assert sorted(r["file"] for r in search_text(project, "hello", file_pattern="**/*.py")) == [
+        "main.py",
+        "pkg/util.py",
+    ]
+    assert [r["file"] for r in search_text(project, "hello", file_pattern="*.py")] == ["main.py"]
+
+
+def test_search_text_context_lines(project: Project) -> None:
+    """Context lines surround the matching line without trailing newlines."""
+    results = search_text(project, "print", case_sensitive=True, context_lines=1)
+    assert len(results) == 1
+    match = results[0]
+    assert match["line"] == 2
+    assert match["text"] == "    print('Hello World')"
+    assert [c["line"] for c in match["context"]] == [1, 2, 3]
+    assert [c["is_match"] for c in match["context"]] == [False, True, False]
+
+
+def test_search_text_skips_binary_files(project: Project) -> None:
+    """Files with NUL bytes or known binary extensions are not searched."""
+    (project.root_path / "data.bin").write_bytes(b"hello\x00world\n")
+    (project.root_path / "image.png").write_bytes(b"hello\n")
+    assert "data.bin" not in {r["file"] for r in search_text(project, "hello")}
+    assert "image.png" not in {r["file"] for r in search_text(project, "hello")}
+
+
+def test_search_text_normalizes_line_endings(project: Project) -> None:
+    """CRLF and CR line endings are counted like universal newlines."""
+    (project.root_path / "crlf.txt").write_bytes(b"one\r\ntwo\rthree needle\n")
+    results = search_text(project, "needle", file_pattern="*.txt")
+    assert [(r["line"], r["text"]) for r in results] == [(3, "three needle")]
+
+
+def test_search_text_literal_case_handling(project: Project) -> None:
+    """Literal patterns honor case sensitivity and ignore surrounding whitespace."""
+    assert [r["file"] for r in search_text(project, "hello world")] == ["main.py"]
+    assert search_text(project, "hello world", case_sensitive=True) == []
+    assert [r["file"] for r in search_text(project, "  Hello World  ", case_sensitive=True)] == ["main.py"]
+    assert [r["file"] for r in search_text(project, "(", case_sensitive=True, file_pattern="main.py")] == [
+        "main.py",
+        "main.py",
+        "main.py",
+    ]
+
+
+def test_search_text_max_results(project: Project) -> None:
+    """No more than max_results matches are returned."""
+    assert len(search_text(project, "e", max_results=2)) == 2
+
+
+def test_query_code_across_files(project: Project) -> None:
+    """Multi-file queries visit every file of the requested language."""
+    results = query_code(
+        project,
+        "(function_definition name: (identifier) @name)",
+        get_language_registry(),
+        get_tree_cache(),
+        language="python",
+    )
+    assert sorted(r["text"] for r in results) == ["helper", "main"]
+
+
+def test_query_code_text_with_non_ascii_source(project: Project) -> None:
+    """Capture text is sliced correctly when the source contains multi-byte characters."""
+    (project.root_path / "uni.py").write_text("s = 'héllo'\ndef après():\n    pass\n", encoding="utf-8")
+    results = query_code(
+        project,
+        "(function_definition name: (identifier) @name)",
+        get_language_registry(),
+        get_tree_cache(),
+        file_path="uni.py",
+    )
+    assert [r["text"] for r in results] == ["après"]
+
+
+def test_query_code_without_snippets(project: Project) -> None:
+    """Results omit the text field when snippets are disabled."""
+    results = query_code(
+        project,
+        "(function_definition name: (identifier) @name)",
+        get_language_registry(),
+        get_tree_cache(),
+        file_path="main.py",
+        include_snippets=False,
+    )
+    assert len(results) == 1
+    assert "text" not in results[0]
+    assert results[0]["start"] == {"row": 0, "column": 4}
+
+
+@pytest.mark.parametrize(
+    "captures",
+    [
+        {"a": ["n1", "n2"], "b": ["n3"]},
+        [("n1", "a"), ("n2", "a"), ("n3", "b")],
+        [SimpleNamespace(node=n, capture_name=c) for n, c in [("n1", "a"), ("n2", "a"), ("n3", "b")]],
+        [{"node": n, "capture": c} for n, c in [("n1", "a"), ("n2", "a"), ("n3", "b")]],
+    ],
+)
+def test_iter_captures_normalizes_formats(captures) -> None:
+    """Every supported captures() return shape yields (node, capture_name) pairs."""
+    assert list(_iter_captures(captures)) == [("n1", "a"), ("n2", "a"), ("n3", "b")]
+
+
+@pytest.mark.parametrize(
+    "captures",
+    [
+        {"a": ["n1", "n2"], "b": ["n3"]},
+        [("n1", "a"), ("n3", "b"), ("n2", "a")],
+    ],
+)
+def test_iter_captures_filter(captures) -> None:
+    """Only captures with the requested name are yielded."""
+    assert sorted(_iter_captures(captures, "a")) == [("n1", "a"), ("n2", "a")]
+    assert list(_iter_captures(captures, "missing")) == []
+
+
+@pytest.mark.parametrize("scope", [{"file_path": "pkg/util.py"}, {"language": "python"}], ids=["file", "project"])
+def test_query_code_predicates_and_capture_filter(project: Project, scope: Dict[str, str]) -> None:
+    """Query predicates are honored and capture_filter keeps a single capture name."""
+    results = query_code(
+        project,
+        '((function_definition name: (identifier) @name) @fn (#eq? @name "helper"))',
+        get_language_registry(),
+        get_tree_cache(),
+        capture_filter="name",
+        **scope,
+    )
+    assert [(r["file"], r["capture"], r["text"]) for r in results] == [("pkg/util.py", "name", "helper")]
+
+
+def test_query_code_compact_across_files(project: Project) -> None:
+    """Compact results are returned from multi-file queries."""
+    results = query_code(
+        project,
+        "(function_definition name: (identifier) @name)",
+        get_language_registry(),
+        get_tree_cache(),
+        language="python",
+        compact=True,
+    )
+    assert sorted(results, key=lambda r: r["text"]) == [
+        {"capture": "name", "text": "helper"},
+        {"capture": "name", "text": "main"},
+    ]
+
+
+def test_query_code_invalid_query_across_files(project: Project) -> None:
+    """An invalid query fails once instead of being skipped for every file."""
+    with pytest.raises(QueryError):
+        query_code(project, "(not_a_node_type) @x", get_language_registry(), get_tree_cache(), language="python")
+
+
+def test_iter_captures_empty_and_unknown() -> None:
+    """Empty or unrecognized capture lists yield nothing."""
+    assert list(_iter_captures([])) == []
+    assert list(_iter_captures([object()])) == []
@@ -0,0 +1,138 @@
+"""Tests for security.py module."""
+
+from pathlib import Path
+
+import pytest
+
+from mcp_server_tree_sitter.api import get_config
+from mcp_server_tree_sitter.config import ServerConfig
+from mcp_server_tree_sitter.exceptions import SecurityError
+from mcp_server_tree_sitter.utils.security import validate_file_access, validate_files_bulk
+
+
+@pytest.fixture
+def root(tmp_path: Path) -> Path:
+    """Create a project root with a source file and an excluded directory."""
+    (tmp_path / "main.py").write_text("print('hi')\n")
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "dep.js").write_text("x = 1\n")
+    return tmp_path
+
+
+def test_validate_file_access_allows_project_file(root: Path) -> None:
+    """Files inside the project root pass validation."""
+    validate_file_access(root / "main.py", root)
+    validate_file_access(str(root / "main.py"), str(root))
+
+
+def test_validate_file_access_rejects_outside_root(root: Path) -> None:
+    """Paths escaping the project root are rejected."""
+    with pytest.raises(SecurityError, match="outside project root"):
+        validate_file_access(root / ".." / "other.py", root)
+
+
+def test_validate_file_access_rejects_sibling_with_common_prefix(root: Path) -> None:
+    """A sibling directory sharing the root's name as a prefix is outside the root."""
+    sibling = root.parent / (root.name + "-other")
+    sibling.mkdir()
+    (sibling / "secret.py").write_text("x = 1\n")
+    with pytest.raises(SecurityError, match="outside project root"):
+        validate_file_access(sibling / "secret.py", root)
+
+
+def test_validate_file_access_rejects_excluded_dir(root: Path) -> None:
+    """Files inside excluded directories are rejected."""
+    with pytest.raises(SecurityError, match="excluded directory: node_modules"):
+        validate_file_access(root / "node_modules" / "dep.js", root)
+
+
+def test_validate_file_access_follows_config_changes(root: Path) -> None:
+    """Security settings changed in place take effect on the next validation."""
+    security = get_config().security
+    original_excluded = list(security.excluded_dirs)
+    original_allowed = security.allowed_extensions
+    try:
+        with pytest.raises(SecurityError, match="excluded directory"):
+            validate_file_access(root / "node_modules" / "dep.js", root)
+
+        security.excluded_dirs.remove("node_modules")
+        validate_file_access(root / "node_modules" / "dep.js", root)
+
+        security.allowed_extensions = ["js"]
+        with pytest.raises(SecurityError, match="File type not allowed"):
+            validate_file_access(root / "main.py", root)
+    finally:
+        security.excluded_dirs[:] = original_excluded
+        security.allowed_extensions = original_allowed
+
+
+def test_validate_file_access_resolves_relative_root_per_call(root: Path, monkeypatch) -> None:
+    """A relative project root is resolved against the current directory on every call."""
+    other = root / "pkg"
+    other.mkdir()
+    monkeypatch.chdir(root)
+    validate_file_access(root / "main.py", ".")
+
+    monkeypatch.chdir(other)
+    with pytest.raises(SecurityError, match="outside project root"):
+        validate_file_access(root / "main.py", ".")
+    assert validate_files_bulk([root / "main.py"], ".") == []
+
+
+def test_validate_file_access_rejects_extension_before_resolving(root: Path, monkeypatch) -> None:
+    """Disallowed extensions are rejected without resolving the path."""
+    security = get_config().security
+    original_allowed = security.allowed_extensions
+    security.allowed_extensions = ["py"]
+    try:
+
+        def fail_resolve(self, strict=False):
+            raise AssertionError("resolve() should not be called")
+
+        monkeypatch.setattr(Path, "resolve", fail_resolve)
+        with pytest.raises(SecurityError, match="File type not allowed"):
+            validate_file_access(root / "notes.txt", root)
+    finally:
+        security.allowed_extensions = original_allowed
+
+
+def test_validate_file_access_with_explicit_config(root: Path) -> None:
+    """A config passed in by the caller is used instead of the global one."""
+    config = ServerConfig()
+    config.security.excluded_dirs = []
+    validate_file_access(root / "node_modules" / "dep.js", root, config)
+
+    with pytest.raises(SecurityError):
+        validate_file_access(root / "node_modules" / "dep.js", root)
+
+
+def test_validate_files_bulk_matches_single_validation(root: Path) -> None:
+    """Bulk validation keeps exactly the files that pass validate_file_access."""
+    (root / "pkg").mkdir()
+    (root / "pkg" / "mod.py").write_text("x = 1\n")
+    (root / "big.py").write_bytes(b"#" * (get_config().security.max_file_size_mb * 1024 * 1024 + 1))
+    outside = root.parent / (root.name + "-other.py")
+    outside.write_text("x = 1\n")
+    (root / "link.py").symlink_to(outside)
+
+    candidates = [
+        root / "main.py",
+        root / "pkg" / "mod.py",
+        root / "pkg" / ".." / "main.py",
+        root / "node_modules" / "dep.js",
+        root / "big.py",
+        root / "link.py",
+        outside,
+        root / "missing.py",
+    ]
+
+    expected = []
+    for path in candidates:
+        try:
+            validate_file_access(path, root)
+        except SecurityError:
+            continue
+        expected.append(path)
+
+    assert validate_files_bulk(candidates, root) == expected
+    assert expected == [root / "main.py", root / "pkg" / "mod.py", root / "pkg" / ".." / "main.py", root / "missing.py"]
@@ -610,3 +610,20 @@ def test_debug_file_saving(test_project) -> None:
         json.dump(dependencies, f, indent=2, cls=BytesEncoder)
 
     print(f"\nDebug information saved to {debug_dir}")
+
+
+def test_analyze_complexity_line_counts_share_one_line_model(tmp_path) -> None:
+    """Line, blank and comment counts agree for CR-only files and non-ASCII indentation."""
+    from tests.test_helpers import analyze_complexity
+
+    # CR line endings, a comment indented with a no-break space, and a form feed
+    source = "# header\r\rx = 1\r # indented comment\r\x0c\ry = 2\r"
+    (tmp_path / "cr.py").write_bytes(source.encode("utf-8"))
+    project_name = f"complexity_{tmp_path.name}"
+    register_project_tool(path=str(tmp_path), name=project_name)
+
+    result = analyze_complexity(project=project_name, file_path="cr.py")
+
+    assert result["line_count"] == 6
+    assert result["comment_lines"] == 2
+    assert result["code_lines"] == 2
@@ -7,17 +7,24 @@ from typing import Any, Dict
 import pytest
 
 from mcp_server_tree_sitter.utils.tree_sitter_helpers import (
+    collect_with_cursor,
     create_edit,
+    create_parser,
+    cursor_walk_tree,
     edit_tree,
     find_all_descendants,
+    find_nodes_by_type,
     get_changed_ranges,
     get_node_text,
+    get_node_text_view,
     get_node_with_text,
     is_node_inside,
     parse_file_incremental,
     parse_file_with_detection,
     parse_source,
     parse_source_incremental,
+    parse_with_cached_tree,
+    update_cached_tree,
     walk_tree,
 )
 
@@ -155,6 +162,25 @@ def test_parse_file_with_unknown_language(tmp_path):
         parse_file_with_detection(unknown_file, "nonexistent_language", registry)
 
 
+def test_parse_file_with_detection_uses_file_suffix(tmp_path):
+    """Detection looks at the file name's suffix only, case-insensitively."""
+    from mcp_server_tree_sitter.language.registry import LanguageRegistry
+
+    registry = LanguageRegistry()
+
+    upper = tmp_path / "SCRIPT.PY"
+    upper.write_text("x = 1\n")
+    tree, _ = parse_file_with_detection(upper, None, registry)
+    assert tree.root_node.type == "module"
+
+    dotted_dir = tmp_path / "pkg.py"
+    dotted_dir.mkdir()
+    no_suffix = dotted_dir / "Makefile"
+    no_suffix.write_text("all:\n")
+    with pytest.raises(ValueError):
+        parse_file_with_detection(no_suffix, None, registry)
+
+
 def test_parse_source(parsed_files):
     """Test parsing source code."""
     # Get Python parser and source
@@ -255,6 +281,37 @@ def test_get_changed_ranges(parsed_files):
     assert len(ranges[0]) == 2  # (start_byte, end_byte)
 
 
+def test_get_changed_ranges_after_edit(parsed_files):
+    """After an incremental reparse only the edited region is reported."""
+    py_parser = parsed_files["python"]["parser"]
+    py_source = parsed_files["python"]["source"]
+    old_tree = py_parser.parse(py_source)
+
+    # Rename the "hello" function: bytes 4..9 become "howdy"
+    start = py_source.index(b"hello")
+    modified_source = py_source[:start] + b"howdy" + py_source[start + 5 :]
+    edit_tree(old_tree, create_edit(start, start + 5, start + 5, (0, start), (0, start + 5), (0, start + 5)))
+    new_tree = py_parser.parse(modified_source, old_tree)
+
+    assert get_changed_ranges(old_tree, new_tree) == []
+
+    # A structural change is reported as a range inside the file, not the whole file
+    insert_at = py_source.index(b"class Person")
+    added = b"x = 1\n"
+    modified_source = py_source[:insert_at] + added + py_source[insert_at:]
+    old_tree = py_parser.parse(py_source)
+    row = py_source[:insert_at].count(b"\n")
+    edit_tree(
+        old_tree,
+        create_edit(insert_at, insert_at, insert_at + len(added), (row, 0), (row, 0), (row + 1, 0)),
+    )
+    new_tree = py_parser.parse(modified_source, old_tree)
+
+    ranges = get_changed_ranges(old_tree, new_tree)
+    assert ranges
+    assert all(insert_at <= start and end <= insert_at + len(added) for start, end in ranges)
+
+
 def test_get_node_text(parsed_files):
     """Test extracting text from a node."""
     # Get Python tree and source
@@ -280,6 +337,30 @@ def test_get_node_text(parsed_files):
     assert b"def hello" in function_text
 
 
+def test_get_node_text_view(parsed_files):
+    """Node views expose the same bytes as get_node_text without copying."""
+    py_tree = parsed_files["python"]["tree"]
+    py_source = parsed_files["python"]["source"]
+    source_view = memoryview(py_source)
+
+    for node in py_tree.root_node.children:
+        view = get_node_text_view(node, source_view)
+        assert view.obj is py_source
+        assert bytes(view) == get_node_text(node, py_source, decode=False)
+
+
+def test_get_node_text_accepts_memoryview(parsed_files):
+    """Text read through a memoryview of the source matches text read from the bytes."""
+    py_tree = parsed_files["python"]["tree"]
+    py_source = parsed_files["python"]["source"]
+    source_view = memoryview(py_source)
+
+    for node in py_tree.root_node.children:
+        assert get_node_text(node, source_view) == get_node_text(node, py_source)
+        assert get_node_text(node, source_view, decode=False) == get_node_text(node, py_source, decode=False)
+        assert isinstance(get_node_text(node, source_view, decode=False), bytes)
+
+
 def test_get_node_with_text(parsed_files):
     """Test finding a node with specific text."""
     # Get Python tree and source
@@ -293,6 +374,27 @@ def test_get_node_with_text(parsed_files):
     assert b"Hello" in node_text
 
 
+def _get_node_with_text_reference(node, source_bytes, text):
+    """Recursive reference for get_node_with_text."""
+    if text in get_node_text(node, source_bytes, decode=False):
+        for child in node.children:
+            result = _get_node_with_text_reference(child, source_bytes, text)
+            if result is not None:
+                return result
+        return node
+    return None
+
+
+@pytest.mark.parametrize("text", [b"Hello", b"print", b"def", b"):\n", b"", b"not in source"])
+def test_get_node_with_text_matches_recursive_search(parsed_files, text):
+    """The cursor search finds the same node as a recursive search."""
+    py_tree = parsed_files["python"]["tree"]
+    py_source = parsed_files["python"]["source"]
+
+    expected = _get_node_with_text_reference(py_tree.root_node, py_source, text)
+    assert get_node_with_text(py_tree.root_node, py_source, text) == expected
+
+
 def test_walk_tree(parsed_files):
     """Test walking a tree with cursor."""
     # Get Python tree
@@ -345,6 +447,20 @@ def test_is_node_inside(parsed_files):
     assert not is_node_inside((999, 0), root_node)
 
 
+def test_is_node_inside_positions_at_boundaries(parsed_files):
+    """Positions on a node's first and last row are compared by column."""
+    py_tree = parsed_files["python"]["tree"]
+    node = py_tree.root_node.children[0]
+    (start_row, start_col), (end_row, end_col) = node.start_point, node.end_point
+
+    assert is_node_inside((start_row, start_col), node)
+    assert is_node_inside((end_row, end_col), node)
+    assert not is_node_inside((end_row, end_col + 1), node)
+    assert is_node_inside((start_row + 1, 0), node)
+    if start_col > 0:
+        assert not is_node_inside((start_row, start_col - 1), node)
+
+
 def test_find_all_descendants(parsed_files):
     """Test finding all descendants of a node."""
     # Get Python tree
@@ -361,6 +477,180 @@ def test_find_all_descendants(parsed_files):
     assert len(limited_descendants) <= len(all_descendants)
 
 
+@pytest.mark.parametrize(
+    "node_type",
+    ["function_definition", "identifier", "expression", "primary_expression", "def", "(", "not_a_node_type"],
+)
+def test_find_nodes_by_type_query_matches_walk(parsed_files, node_type):
+    """Query and symbol id lookups return the same nodes, in order, as the tree walk."""
+    py_tree = parsed_files["python"]["tree"]
+
+    walked = find_nodes_by_type(py_tree.root_node, node_type)
+    queried = find_nodes_by_type(py_tree.root_node, node_type, py_tree.language)
+
+    assert [n.byte_range for n in queried] == [n.byte_range for n in walked]
+    assert all(n.type == node_type for n in queried)
+
+
+def test_cursor_walk_tree_skips_children(parsed_files):
+    """Returning False from the visitor skips that node's subtree only."""
+    root = parsed_files["python"]["tree"].root_node
+
+    def descend(node):
+        return node.type != "class_definition"
+
+    expected = []
+
+    def reference(node, depth):
+        expected.append((node.type, node.byte_range, depth))
+        if descend(node):
+            for child in node.children:
+                reference(child, depth + 1)
+
+    reference(root, 0)
+
+    visited = []
+
+    def visit(node, _field_name, depth):
+        visited.append((node.type, node.byte_range, depth))
+        return descend(node)
+
+    cursor_walk_tree(root, visit)
+
+    assert visited == expected
+    assert any(t == "if_statement" for t, _, _ in visited)
+    assert not any(t == "function_definition" and d > 1 for t, _, d in visited)
+
+
+def test_collect_with_cursor_field_names(parsed_files):
+    """Field names are reported only when requested."""
+    py_tree = parsed_files["python"]["tree"]
+
+    def collector(node, field_name, _depth):
+        return (node.type, field_name)
+
+    without_fields = collect_with_cursor(py_tree.root_node, collector)
+    assert all(field_name is None for _, field_name in without_fields)
+
+    with_fields = collect_with_cursor(py_tree.root_node, collector, want_field_name=True)
+    assert ("identifier", "name") in with_fields
+    assert ("parameters", "parameters") in with_fields
+    assert [t for t, _ in with_fields] == [t for t, _ in without_fields]
+
+
+def test_update_cached_tree_with_new_source(tmp_path, python_language):
+    """An edit can be applied from source bytes the caller already has."""
+    from mcp_server_tree_sitter.cache.parser_cache import TreeCache
+
+    path = tmp_path / "edit.py"
+    path.write_bytes(b"x = 1\n")
+    language_obj = python_language
+    cache = TreeCache()
+    parse_with_cached_tree(path, "python", language_obj, tree_cache=cache)
+
+    # Replace "1" with "123" without touching the file on disk
+    new_source = b"x = 123\n"
+    result = update_cached_tree(
+        path, "python", language_obj, 4, 5, 7, (0, 4), (0, 5), (0, 7), tree_cache=cache, new_source=new_source
+    )
+
+    assert result is not None
+    tree, source = result
+    assert source == new_source
+    assert get_node_text(tree.root_node, source) == "x = 123\n"
+    assert cache.get(path, "python")[1] == new_source
+
+
+def test_update_cached_tree_falls_back_to_full_parse(tmp_path, monkeypatch, python_language):
+    """A failed incremental parse is redone from scratch rather than served from the cache."""
+    from mcp_server_tree_sitter.cache.parser_cache import TreeCache
+    from mcp_server_tree_sitter.utils import tree_sitter_helpers
+
+    path = tmp_path / "edit.py"
+    path.write_bytes(b"x = 1\n")
+    language_obj = python_language
+    cache = TreeCache()
+    parse_with_cached_tree(path, "python", language_obj, tree_cache=cache)
+
+    def fail_incremental(source, old_tree, parser):
+        raise RuntimeError("incremental parse failed")
+
+    monkeypatch.setattr(tree_sitter_helpers, "parse_source_incremental", fail_incremental)
+
+    new_source = b"x = 123\n"
+    result = update_cached_tree(
+        path, "python", language_obj, 4, 5, 7, (0, 4), (0, 5), (0, 7), tree_cache=cache, new_source=new_source
+    )
+
+    assert result is not None
+    tree, source = result
+    assert source == new_source
+    assert not tree.root_node.has_changes
+    assert get_node_text(tree.root_node, source) == "x = 123\n"
+
+
+def test_update_cached_tree_file_removed(tmp_path, monkeypatch, python_language):
+    """A file that disappears before its new source is read gives None rather than raising."""
+    from mcp_server_tree_sitter.cache.parser_cache import TreeCache
+
+    path = tmp_path / "edit.py"
+    path.write_bytes(b"x = 1\n")
+    language_obj = python_language
+    cache = TreeCache()
+    parse_with_cached_tree(path, "python", language_obj, tree_cache=cache)
+
+    # Keep serving the cached tree, as if the file vanished after the lookup
+    cached = cache.get(path, "python")
+    monkeypatch.setattr(cache, "get", lambda file_path, language: cached)
+    path.unlink()
+
+    result = update_cached_tree(path, "python", language_obj, 4, 5, 7, (0, 4), (0, 5), (0, 7), tree_cache=cache)
+
+    assert result is None
+
+
+@pytest.mark.parametrize("max_depth", [None, -1, 0, 1, 2, 3, 50])
+def test_find_all_descendants_matches_recursive_walk(parsed_files, max_depth):
+    """Descendants come back in pre-order and respect the depth limit."""
+    root = parsed_files["python"]["tree"].root_node
+
+    expected = []
+
+    def visit(node, depth):
+        for child in node.children:
+            if max_depth is None or depth + 1 <= max_depth:
+                expected.append(child)
+                visit(child, depth + 1)
+
+    if max_depth is None or max_depth >= 0:
+        visit(root, 0)
+
+    result = find_all_descendants(root, max_depth=max_depth)
+    assert [(n.type, n.byte_range) for n in result] == [(n.type, n.byte_range) for n in expected]
+
+
+def test_create_parser_is_cached_per_thread():
+    """Parsers are reused within a thread but never shared across threads."""
+    import threading
+
+    from mcp_server_tree_sitter.language.registry import LanguageRegistry
+
+    registry = LanguageRegistry()
+    python = registry.get_language("python")
+    javascript = registry.get_language("javascript")
+
+    parser = create_parser(python)
+    assert create_parser(python) is parser
+    assert create_parser(javascript) is not parser
+    assert parser.parse(b"x = 1\n").root_node.type == "module"
+
+    other: list = []
+    thread = threading.Thread(target=lambda: other.append(create_parser(python)))
+    thread.start()
+    thread.join()
+    assert other[0] is not parser
+
+
 # Test edge cases and error handling
 def test_get_node_text_with_invalid_byte_range(parsed_files):
     """Test get_node_text with invalid byte range."""